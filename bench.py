@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from perft import BOARD_TYPES, BULK, MODES, perft
+
+"""
+perft benchmark: counts the nodes of a set of positions and reports nodes, wall time and nodes per second
+usage: python bench.py [--depth D] [--repeat N] [--epd FILE] [--bitboard] [--mode {plain,bulk,hashed}]
+       [--save FILE] [--compare FILE] [--threshold PERCENT]
+"""
+
+# format: List[Tuple[name, fen, default depth, known node counts from depth 1]]
+BENCHMARK_POSITIONS: List[Tuple[str, str, int, List[int]]] = [
+    ('starting position', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1', 3,
+     [20, 400, 8_902, 197_281, 4_865_609, 119_060_324]),
+    ('position 2', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1', 2,
+     [48, 2_039, 97_862, 4_085_603, 193_690_690]),
+    ('position 3', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', 3,
+     [14, 191, 2_812, 43_238, 674_624, 11_030_083]),
+    ('position 4', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', 3,
+     [6, 264, 9_467, 422_333, 15_833_292]),
+    ('position 5', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', 2,
+     [44, 1_486, 62_379, 2_103_487, 89_941_194]),
+    ('position 6', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10', 2,
+     [46, 2_079, 89_890, 3_894_594, 164_075_551]),
+]
+
+# format: Dict[name, fen, depth, mode, nodes, expected nodes, times, mean time, min time, stdev time, nps]
+RESULT = Dict[str, object]
+
+
+def load_epd(path: str, default_depth: int = 2) -> List[Tuple[str, str, int, List[int]]]:
+    """
+    load positions from an epd file with one position per line; known node counts are given as ";D<depth> <nodes>"
+    e.g.: "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - ;D1 14 ;D2 191"
+    :param path: path of the epd file
+    :param default_depth: depth used for positions without node counts
+    :return: format: List[Tuple[name, fen, deepest depth with known node count or default depth, known node counts]]
+    """
+    positions = []
+    with open(path) as file:
+        for n_line, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = [field.strip() for field in line.split(';')]
+            fen = fields[0]
+            if len(fen.split()) == 4:  # epd positions have no move counters
+                fen += ' 0 1'
+            counts: Dict[int, int] = {}
+            for field in fields[1:]:
+                if field.startswith('D'):
+                    depth, nodes = field[1:].split()
+                    counts[int(depth)] = int(nodes)
+            known = [counts[depth] for depth in range(1, len(counts) + 1) if depth in counts]
+            positions.append((f'{path}:{n_line}', fen, len(known) if known else default_depth, known))
+    return positions
+
+
+def run_benchmark(positions: List[Tuple[str, str, int, List[int]]], depth: Optional[int] = None, repeat: int = 3,
+                  board_type: str = 'board', mode: str = BULK) -> List[RESULT]:
+    """
+    count the nodes of every position repeatedly and measure the wall time
+    :param positions: format: List[Tuple[name, fen, default depth, known node counts from depth 1]]
+    :param depth: depth used for all positions; the default depth of every position is used if None
+    :param repeat: number of runs per position
+    :param board_type: 'board' or 'bitboard'
+    :param mode: perft mode; PLAIN, BULK or HASHED
+    :return: one result dict per position
+    """
+    results = []
+    for name, fen, default_depth, known in positions:
+        depth_ = default_depth if depth is None else depth
+        times = []
+        nodes = 0
+        for _ in range(repeat):
+            board = BOARD_TYPES[board_type](fen)
+            start = time.perf_counter()
+            nodes = perft(board, depth_, mode)
+            times.append(time.perf_counter() - start)
+        results.append({
+            'name': name, 'fen': fen, 'depth': depth_, 'mode': mode, 'nodes': nodes,
+            'expected_nodes': known[depth_ - 1] if depth_ <= len(known) else None, 'times': times,
+            'mean_time': statistics.mean(times), 'min_time': min(times),
+            'stdev_time': statistics.stdev(times) if len(times) > 1 else 0.0,
+            'nps': int(nodes / max(min(times), 1e-9)),
+        })
+    return results
+
+
+def save_baseline(results: List[RESULT], path: str) -> None:
+    """
+    save benchmark results as json baseline
+    :param results: results of run_benchmark
+    :param path: path of the json file
+    """
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+
+
+def load_baseline(path: str) -> List[RESULT]:
+    """
+    load a json baseline
+    :param path: path of the json file
+    :return: results of run_benchmark
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(results: List[RESULT], baseline: List[RESULT], threshold: float = 5.0) -> List[str]:
+    """
+    compare the nodes per second of the results with a baseline; positions are matched by fen, depth and mode
+    :param results: results of run_benchmark
+    :param baseline: results of an earlier run
+    :param threshold: allowed slowdown in percent
+    :return: one message per regression; empty if no position got slower than allowed
+    """
+    baseline_nps = {(result['fen'], result['depth'], result.get('mode', BULK)): result['nps'] for result in baseline}
+    regressions = []
+    for result in results:
+        old_nps = baseline_nps.get((result['fen'], result['depth'], result.get('mode', BULK)))
+        if not old_nps:
+            continue
+        change = (result['nps'] - old_nps) * 100 / old_nps
+        if change < -threshold:
+            regressions.append(f'{result["name"]} (depth {result["depth"]}): {result["nps"]} nps vs {old_nps} nps '
+                               f'in baseline ({change:+.1f}%)')
+    return regressions
+
+
+def format_result(result: RESULT) -> str:
+    """
+    :param result: result of run_benchmark
+    :return: one line report of the result
+    """
+    check = '' if result['expected_nodes'] is None else \
+        ' ok' if result['nodes'] == result['expected_nodes'] else f' WRONG (expected {result["expected_nodes"]})'
+    return f'{result["name"]:<20} depth {result["depth"]} nodes {result["nodes"]:>10}{check} ' \
+           f'time {result["mean_time"]:.3f} s +- {result["stdev_time"]:.3f} (min {result["min_time"]:.3f}) ' \
+           f'nps {result["nps"]}'
+
+
+def _main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the move generation with perft.')
+    parser.add_argument('--depth', type=int, help='depth for all positions instead of the default depths')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per position')
+    parser.add_argument('--epd', help='epd file with additional positions')
+    parser.add_argument('--bitboard', action='store_true', help='use the bitboard engine')
+    parser.add_argument('--mode', choices=MODES, default=BULK, help='perft mode')
+    parser.add_argument('--save', help='save the results as json baseline')
+    parser.add_argument('--compare', help='compare the results with a json baseline')
+    parser.add_argument('--threshold', type=float, default=5.0, help='allowed slowdown in percent')
+    args = parser.parse_args()
+
+    positions = list(BENCHMARK_POSITIONS)
+    if args.epd:
+        positions += load_epd(args.epd)
+    results = run_benchmark(positions, args.depth, args.repeat, 'bitboard' if args.bitboard else 'board', args.mode)
+    for result in results:
+        print(format_result(result))
+    total_nodes = sum(result['nodes'] for result in results)
+    total_time = sum(result['min_time'] for result in results)
+    print(f'\nTotal: nodes {total_nodes} time {total_time:.3f} s nps {int(total_nodes / max(total_time, 1e-9))}')
+    if args.save:
+        save_baseline(results, args.save)
+    failed = any(result['expected_nodes'] is not None and not result['nodes'] == result['expected_nodes']
+                 for result in results)
+    if args.compare:
+        regressions = compare(results, load_baseline(args.compare), args.threshold)
+        for regression in regressions:
+            print('Regression:', regression)
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(_main())
@@ -0,0 +1,827 @@
+from __future__ import annotations
+
+import contextlib
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING, Union
+
+import packed_move
+import zobrist
+from pieces import KING_TARGETS, KNIGHT_TARGETS, PAWN_ATTACKS, PIECE_SQUARE_SCORES, RAYS
+
+if TYPE_CHECKING:
+    from chess import MOVE
+
+"""
+bitboard representation of a chess position
+every piece type of every color is stored as a 64-bit integer with one bit per square (bit 0: a1, bit 63: h8)
+"""
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+# index of a piece type in the bitboard list is piece type + 6 * color; color 0: white, 1: black
+_FEN_SYMBOLS: str = 'PNBRQKpnbrqk'
+_SYMBOLS: str = '♟♞♝♜♛♚♙♘♗♖♕♔'
+_PROMOTION_TYPES: Dict[str, int] = {'q': QUEEN, 'r': ROOK, 'b': BISHOP, 'n': KNIGHT}
+_PIECE_KEYS: List[List[int]] = [zobrist.PIECE_KEYS[symbol] for symbol in _FEN_SYMBOLS]
+_PIECE_SCORES: List[List[int]] = [PIECE_SQUARE_SCORES[symbol] for symbol in _FEN_SYMBOLS]
+# packed move bits of all promotion types per color
+_PROMOTION_BITS: Tuple[Tuple[int, ...], ...] = tuple(tuple(packed_move.PROMOTION_BITS[type_] for type_ in types)
+                                                     for types in ('QRBN', 'qrbn'))
+
+_FULL: int = (1 << 64) - 1
+_FILE_A: int = 0x0101010101010101
+_FILE_H: int = _FILE_A << 7
+_RANK_1: int = 0xFF
+_RANK_3: int = _RANK_1 << 16
+_RANK_6: int = _RANK_1 << 40
+_RANK_8: int = _RANK_1 << 56
+
+# castling rights bits; format: K, Q, k, q
+_WK, _WQ, _BK, _BQ = 1, 2, 4, 8
+
+
+def _lsb(bb: int) -> int:
+    """
+    :return: index of the least significant set bit
+    """
+    return (bb & -bb).bit_length() - 1
+
+
+def _squares(bb: int) -> List[int]:
+    """
+    :return: indices of all set bits
+    """
+    squares = []
+    while bb:
+        lsb = bb & -bb
+        squares.append(lsb.bit_length() - 1)
+        bb ^= lsb
+    return squares
+
+
+def _mask(squares: List[int]) -> int:
+    """
+    :return: mask with the bits of all given squares set
+    """
+    bb = 0
+    for pos in squares:
+        bb |= 1 << pos
+    return bb
+
+
+# masks of the attack and ray tables of the pieces module
+_KNIGHT_ATTACKS: List[int] = [_mask(targets) for targets in KNIGHT_TARGETS]
+_KING_ATTACKS: List[int] = [_mask(targets) for targets in KING_TARGETS]
+# squares attacked by a pawn of the given color on the given square
+_PAWN_ATTACKS: Tuple[List[int], List[int]] = ([_mask(targets) for targets in PAWN_ATTACKS[True]],
+                                              [_mask(targets) for targets in PAWN_ATTACKS[False]])
+# positive directions: first blocker is the least significant bit; negative directions: the most significant bit
+_NORTH: List[int] = [_mask(ray) for ray in RAYS[8]]
+_EAST: List[int] = [_mask(ray) for ray in RAYS[1]]
+_NORTH_EAST: List[int] = [_mask(ray) for ray in RAYS[9]]
+_NORTH_WEST: List[int] = [_mask(ray) for ray in RAYS[7]]
+_SOUTH: List[int] = [_mask(ray) for ray in RAYS[-8]]
+_WEST: List[int] = [_mask(ray) for ray in RAYS[-1]]
+_SOUTH_EAST: List[int] = [_mask(ray) for ray in RAYS[-7]]
+_SOUTH_WEST: List[int] = [_mask(ray) for ray in RAYS[-9]]
+
+
+def _between_and_line() -> Tuple[List[List[int]], List[List[int]]]:
+    """
+    :return: masks of the squares between two aligned squares and of the whole line through them
+    """
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for rays, opposite_rays in ((_NORTH, _SOUTH), (_EAST, _WEST), (_NORTH_EAST, _SOUTH_WEST),
+                                (_NORTH_WEST, _SOUTH_EAST)):
+        for a in range(64):
+            for b in _squares(rays[a]):
+                between[a][b] = between[b][a] = rays[a] & opposite_rays[b]
+                line[a][b] = line[b][a] = rays[a] | opposite_rays[a] | (1 << a)
+    return between, line
+
+
+_BETWEEN, _LINE = _between_and_line()
+
+
+def _bishop_attacks(pos: int, occ: int) -> int:
+    """
+    :param pos: square of the bishop
+    :param occ: mask of all occupied squares
+    :return: mask of all squares attacked by a bishop on the given square
+    """
+    attacks = _NORTH_EAST[pos]
+    blockers = attacks & occ
+    if blockers:
+        attacks ^= _NORTH_EAST[(blockers & -blockers).bit_length() - 1]
+    ray = _NORTH_WEST[pos]
+    blockers = ray & occ
+    if blockers:
+        ray ^= _NORTH_WEST[(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+    ray = _SOUTH_EAST[pos]
+    blockers = ray & occ
+    if blockers:
+        ray ^= _SOUTH_EAST[blockers.bit_length() - 1]
+    attacks |= ray
+    ray = _SOUTH_WEST[pos]
+    blockers = ray & occ
+    if blockers:
+        ray ^= _SOUTH_WEST[blockers.bit_length() - 1]
+    return attacks | ray
+
+
+def _rook_attacks(pos: int, occ: int) -> int:
+    """
+    :param pos: square of the rook
+    :param occ: mask of all occupied squares
+    :return: mask of all squares attacked by a rook on the given square
+    """
+    attacks = _NORTH[pos]
+    blockers = attacks & occ
+    if blockers:
+        attacks ^= _NORTH[(blockers & -blockers).bit_length() - 1]
+    ray = _EAST[pos]
+    blockers = ray & occ
+    if blockers:
+        ray ^= _EAST[(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+    ray = _SOUTH[pos]
+    blockers = ray & occ
+    if blockers:
+        ray ^= _SOUTH[blockers.bit_length() - 1]
+    attacks |= ray
+    ray = _WEST[pos]
+    blockers = ray & occ
+    if blockers:
+        ray ^= _WEST[blockers.bit_length() - 1]
+    return attacks | ray
+
+
+# castling rights that remain after a piece moves from or to the given square
+_CASTLING_MASK: List[int] = [15] * 64
+_CASTLING_MASK[4], _CASTLING_MASK[7], _CASTLING_MASK[0] = 15 ^ (_WK | _WQ), 15 ^ _WK, 15 ^ _WQ
+_CASTLING_MASK[60], _CASTLING_MASK[63], _CASTLING_MASK[56] = 15 ^ (_BK | _BQ), 15 ^ _BK, 15 ^ _BQ
+
+
+class BitBoard:
+    def __init__(self, fen: Optional[str] = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1') -> None:
+        self._bbs: List[int]  # one mask per piece type and color; format: List[P, N, B, R, Q, K, p, n, b, r, q, k]
+        self._occ: List[int]  # occupancy per color; format: List[white pieces, black pieces]
+        self._squares: List[Union[None, int]]  # bitboard index of the piece on every square or None
+        self._white_to_move: bool
+        self._castling_rights: int
+        self._ep_target_square: Union[None, int]
+        self._half_move_clock: int
+        self._turn_number: int
+        self._load_position_from_fen(fen)
+        # format: Tuple[old pos, new pos, promotion type or 0, moving piece, captured piece, capture pos, castling
+        # rights, ep target square, half move clock]
+        self._undo_log: List[Tuple[int, int, int, int, Union[None, int], int, int, Union[None, int], int]] = []
+        self._moves_log: List[Union[MOVE, int]] = []  # all made moves in the representation they were made in
+        self._zobrist_key: int = self._get_zobrist_key()
+        self._zobrist_log: List[int] = [self._zobrist_key]  # zobrist keys of all positions
+        self._score: int = self._get_score()  # material and piece-square score; white minus black
+        self._score_log: List[int] = [self._score]  # scores of all positions
+        self._legal_moves_cache: Union[None, Set[MOVE]] = None
+        self._packed_legal_moves_cache: Union[None, List[int]] = None
+
+    def __repr__(self) -> str:
+        def positions_to_str() -> str:
+            output = ''
+            for row in range(7, -1, -1):
+                output += ' ' + str(row + 1) + ' '
+                for file in range(8):
+                    index = self._squares[(row * 8) + file]
+                    output += ' - ' if index is None else ' ' + _SYMBOLS[index] + ' '
+                output += ' ' + str(row + 1) + ' \n'
+            return output
+
+        return f'    a  b  c  d  e  f  g  h\n{positions_to_str()}    a  b  c  d  e  f  g  h\n\n> color to move: ' \
+               f'{self._color_to_move_to_fen()}\n> castling rights: {self._castling_rights_to_fen()}\n> ep target: ' \
+               f'{self._ep_target_square_to_fen()}\n> half move clock: {self._half_move_clock}\n> turn: ' \
+               f'{self._turn_number}\n'
+
+    """
+    chess game data getters
+    """
+
+    @property
+    def fen(self) -> str:
+        """
+        get the fen string of the current position
+        :return: fen string
+        """
+        return self._board_to_fen()
+
+    @property
+    def white_to_move(self) -> bool:
+        """
+        get the color to move
+        :return: whether white to move
+        """
+        return self._white_to_move
+
+    @property
+    def castling_rights(self) -> List[bool]:
+        """
+        get the castling rights
+        :return: the castling rights; format: List[K, Q, k, q]
+        """
+        return [bool(self._castling_rights & right) for right in (_WK, _WQ, _BK, _BQ)]
+
+    @property
+    def ep_target_square(self) -> Union[int, None]:
+        """
+        get the en passant target square
+        :return: the en passant target square
+        """
+        return self._ep_target_square
+
+    @property
+    def half_move_clock(self) -> int:
+        """
+        get the half move clock
+        :return: the half move clock
+        """
+        return self._half_move_clock
+
+    @property
+    def turn_number(self) -> int:
+        """
+        get the turn number
+        :return: the turn number
+        """
+        return self._turn_number
+
+    @property
+    def zobrist_key(self) -> int:
+        """
+        get the zobrist key of the position; equal to the key of board.Board for the same position
+        :return: 64-bit key of the pieces, color to move, castling rights and ep target square
+        """
+        return self._zobrist_key
+
+    """
+    board state
+    """
+
+    @property
+    def is_win(self) -> bool:
+        """
+        test if the position is a win for a player
+        :return: whether the position is a win for a player
+        """
+        return self.checkmate
+
+    @property
+    def is_draw(self) -> bool:
+        """
+        test if the current position is draw
+        :return: whether the current position is draw
+        """
+        return self.stalemate or self.seventy_five_move_rule_applies or self.fivefold_repetition_rule_applies or \
+            self.is_dead_position
+
+    @property
+    def checkmate(self) -> bool:
+        """
+        test whether the current board constellation is checkmate
+        :return: whether its checkmate
+        """
+        return len(self._legal_moves) == 0 and self.is_king_attacked(self._white_to_move)
+
+    @property
+    def stalemate(self) -> bool:
+        """
+        test whether the current board constellation is stalemate
+        :return: whether its stalemate
+        """
+        return len(self._legal_moves) == 0 and not self.is_king_attacked(self._white_to_move)
+
+    @property
+    def seventy_five_move_rule_applies(self) -> bool:
+        """
+        test if the seventy-five-move rule applies thus leading to a draw
+        :return: whether the seventy-five-move rules applies
+        """
+        return self._half_move_clock >= 75 and not self.checkmate
+
+    @property
+    def fivefold_repetition_rule_applies(self) -> bool:
+        """
+        test if the current position occurred five times in a row every other move of the same color
+        :return: whether the fivefold repetition rule applies
+        """
+        log = self._zobrist_log
+        if len(log) < 17:
+            return False
+        return log[-1] == log[-5] == log[-9] == log[-13] == log[-17]
+
+    @property
+    def is_dead_position(self) -> bool:
+        """
+        test if the current position is a dead position
+        :return: whether the current position is a dead position
+        """
+        bbs = self._bbs
+        n_pieces = bin(self._occ[0] | self._occ[1]).count('1')
+        if n_pieces > 4:
+            return False
+        if n_pieces == 2:
+            return True
+        minor_pieces = bbs[KNIGHT] | bbs[BISHOP] | bbs[KNIGHT + 6] | bbs[BISHOP + 6]
+        if n_pieces == 3:
+            return bool(minor_pieces)
+        if bbs[KNIGHT] | bbs[KNIGHT + 6] or not minor_pieces or not bbs[BISHOP] or not bbs[BISHOP + 6]:
+            return False
+        w_bishop, b_bishop = _lsb(bbs[BISHOP]), _lsb(bbs[BISHOP + 6])
+        return (w_bishop % 8 + w_bishop // 8) % 2 == (b_bishop % 8 + b_bishop // 8) % 2
+
+    @property
+    def val(self) -> float:
+        """
+        get the value of the board for the color to move
+        :return: value to the board
+        """
+        if self.is_win:
+            return float('-inf')
+        if self.is_draw:
+            return 0
+        return self.static_eval
+
+    @property
+    def static_eval(self) -> int:
+        """
+        get the material and piece-square score of the board for the color to move without detecting checkmates and
+        draws; kept up to date by make_move
+        :return: value of the board
+        """
+        return self._score if self._white_to_move else -self._score
+
+    """
+    legal moves
+    """
+
+    @property
+    def legal_moves(self) -> Set[MOVE]:
+        """
+        get the legal moves
+        :return: legal moves
+        """
+        return self._legal_moves
+
+    @property
+    def _legal_moves(self) -> Set[MOVE]:
+        """
+        get legal moves for usage inside the object
+        :return: legal moves
+        """
+        if self._legal_moves_cache is None:
+            self._legal_moves_cache = {packed_move.decode(move) for move in self.packed_legal_moves}
+        return self._legal_moves_cache
+
+    @property
+    def legal_captures(self) -> Set[MOVE]:
+        """
+        get the legal captures and promotions
+        :return: legal captures and promotions
+        """
+        squares, ep_target_square = self._squares, self._ep_target_square
+        return {packed_move.decode(move) for move in self.packed_legal_moves
+                if move >> packed_move.PROMOTION_SHIFT or squares[move >> 6 & 63] is not None or
+                (move >> 6 & 63 == ep_target_square and squares[move & 63] % 6 == PAWN)}
+
+    @property
+    def packed_legal_moves(self) -> List[int]:
+        """
+        get the legal moves in the packed form of the packed_move module; cheaper than the move tuples
+        :return: legal moves
+        """
+        if self._packed_legal_moves_cache is None:
+            self._packed_legal_moves_cache = self._get_legal_moves()
+        return self._packed_legal_moves_cache
+
+    def _get_legal_moves(self) -> List[int]:
+        """
+        generate all legal moves with the checking pieces and the pinned pieces computed once per position
+        :return: list of all legal moves in packed form
+        """
+        moves: List[int] = []
+        append = moves.append
+        bbs = self._bbs
+        white = self._white_to_move
+        us, them = (0, 6) if white else (6, 0)
+        own, opp = (self._occ[0], self._occ[1]) if white else (self._occ[1], self._occ[0])
+        occ = own | opp
+        not_own = ~own & _FULL
+        king_pos = _lsb(bbs[KING + us])
+        opp_pawns, opp_knights = bbs[PAWN + them], bbs[KNIGHT + them]
+        opp_diagonal = bbs[BISHOP + them] | bbs[QUEEN + them]
+        opp_straight = bbs[ROOK + them] | bbs[QUEEN + them]
+        opp_king_pos = _lsb(bbs[KING + them])
+
+        # king moves; the king is removed from the occupancy so it cannot hide behind itself
+        occ_without_king = occ ^ (1 << king_pos)
+        for new_pos in _squares(_KING_ATTACKS[king_pos] & not_own):
+            if not self._is_attacked(new_pos, white, occ_without_king, opp_pawns, opp_knights, opp_diagonal,
+                                     opp_straight, opp_king_pos):
+                append(king_pos | new_pos << 6)
+
+        checkers = (_PAWN_ATTACKS[0 if white else 1][king_pos] & opp_pawns) | \
+                   (_KNIGHT_ATTACKS[king_pos] & opp_knights) | \
+                   (_bishop_attacks(king_pos, occ) & opp_diagonal) | (_rook_attacks(king_pos, occ) & opp_straight)
+        if checkers & (checkers - 1):  # double check
+            return moves
+        if checkers:
+            target_mask = (checkers | _BETWEEN[king_pos][_lsb(checkers)]) & not_own
+        else:
+            target_mask = not_own
+            self._add_castling_moves(append, white, occ, opp_pawns, opp_knights, opp_diagonal, opp_straight,
+                                     opp_king_pos)
+
+        # pinned pieces and the line they are allowed to move on
+        pinned = 0
+        pin_lines: Dict[int, int] = {}
+        snipers = (_bishop_attacks(king_pos, opp) & opp_diagonal) | (_rook_attacks(king_pos, opp) & opp_straight)
+        while snipers:
+            sniper = snipers & -snipers
+            snipers ^= sniper
+            sniper_pos = sniper.bit_length() - 1
+            blockers = _BETWEEN[king_pos][sniper_pos] & occ
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pinned |= blockers
+                pin_lines[blockers.bit_length() - 1] = _LINE[king_pos][sniper_pos]
+
+        self._add_pawn_moves(append, white, bbs[PAWN + us], opp, occ, target_mask, pinned, pin_lines)
+        self._add_en_passant_moves(append, white, king_pos, bbs[PAWN + us], occ, checkers, opp_pawns,
+                                   opp_knights, opp_diagonal, opp_straight)
+
+        for pos in _squares(bbs[KNIGHT + us] & ~pinned):
+            for new_pos in _squares(_KNIGHT_ATTACKS[pos] & target_mask):
+                append(pos | new_pos << 6)
+        for index, attacks in ((BISHOP, _bishop_attacks), (ROOK, _rook_attacks)):
+            for pos in _squares(bbs[index + us] | bbs[QUEEN + us]):
+                targets = attacks(pos, occ) & target_mask
+                if pinned >> pos & 1:
+                    targets &= pin_lines[pos]
+                for new_pos in _squares(targets):
+                    append(pos | new_pos << 6)
+        return moves
+
+    @staticmethod
+    def _add_pawn_moves(append, white: bool, pawns: int, opp: int, occ: int, target_mask: int, pinned: int,
+                        pin_lines: Dict[int, int]) -> None:
+        """
+        add all pawn advances and captures except en passant captures
+        pushes and captures are generated for all pawns at once by shifting the pawn mask
+        """
+        empty = ~occ & _FULL
+        free_pawns = pawns & ~pinned
+        if white:
+            single = (free_pawns << 8) & empty
+            double = ((single & _RANK_3) << 8) & empty & target_mask
+            single &= target_mask
+            left = ((free_pawns & ~_FILE_A) << 7) & opp & target_mask
+            right = ((free_pawns & ~_FILE_H) << 9) & opp & target_mask
+            diffs, promotion_types = (8, 16, 7, 9), _PROMOTION_BITS[0]
+        else:
+            single = (free_pawns >> 8) & empty
+            double = ((single & _RANK_6) >> 8) & empty & target_mask
+            single &= target_mask
+            left = ((free_pawns & ~_FILE_A) >> 9) & opp & target_mask
+            right = ((free_pawns & ~_FILE_H) >> 7) & opp & target_mask
+            diffs, promotion_types = (-8, -16, -9, -7), _PROMOTION_BITS[1]
+        promotion_rank = _RANK_8 | _RANK_1
+        for targets, diff in ((single, diffs[0]), (left, diffs[2]), (right, diffs[3])):
+            for new_pos in _squares(targets & ~promotion_rank):
+                append(new_pos - diff | new_pos << 6)
+            for new_pos in _squares(targets & promotion_rank):
+                for promotion_bits in promotion_types:
+                    append(new_pos - diff | new_pos << 6 | promotion_bits)
+        for new_pos in _squares(double):
+            append(new_pos - diffs[1] | new_pos << 6)
+
+        # pinned pawns can only move along the pin line
+        for pos in _squares(pawns & pinned):
+            bb = 1 << pos
+            push = (bb << 8 if white else bb >> 8) & empty
+            targets = push | (_PAWN_ATTACKS[0 if white else 1][pos] & opp)
+            if push and (bb & (_RANK_1 << 8 if white else _RANK_1 << 48)):
+                targets |= (push << 8 if white else push >> 8) & empty
+            for new_pos in _squares(targets & target_mask & pin_lines[pos]):
+                if (1 << new_pos) & promotion_rank:
+                    for promotion_bits in promotion_types:
+                        append(pos | new_pos << 6 | promotion_bits)
+                else:
+                    append(pos | new_pos << 6)
+
+    def _add_en_passant_moves(self, append, white: bool, king_pos: int, pawns: int, occ: int, checkers: int,
+                              opp_pawns: int, opp_knights: int, opp_diagonal: int, opp_straight: int) -> None:
+        """
+        add en passant captures
+        both pawns leave their squares at once which may discover an attack on the own king, so the capture is tested
+        against the sliders with the resulting occupancy
+        """
+        ep = self._ep_target_square
+        if ep is None:
+            return
+        captured_pos = ep - 8 if white else ep + 8
+        captured = 1 << captured_pos
+        if checkers & ~captured & (opp_knights | opp_pawns):
+            return
+        for pos in _squares(_PAWN_ATTACKS[1 if white else 0][ep] & pawns):
+            new_occ = (occ ^ (1 << pos) ^ captured) | (1 << ep)
+            if _bishop_attacks(king_pos, new_occ) & opp_diagonal or _rook_attacks(king_pos, new_occ) & opp_straight:
+                continue
+            append(pos | ep << 6)
+
+    def _add_castling_moves(self, append, white: bool, occ: int, opp_pawns: int, opp_knights: int,
+                            opp_diagonal: int, opp_straight: int, opp_king_pos: int) -> None:
+        """
+        add castling moves; only called if the king is not in check
+        """
+        rights = self._castling_rights
+        # format: Tuple[right, king pos, new king pos, squares to be empty, squares to be safe]
+        for right, king_pos, new_pos, empty, safe in (((_WK, 4, 6, 0x60, (5, 6)), (_WQ, 4, 2, 0x0E, (3, 2)))
+                                                      if white else
+                                                      ((_BK, 60, 62, 0x60 << 56, (61, 62)),
+                                                       (_BQ, 60, 58, 0x0E << 56, (59, 58)))):
+            if not rights & right or occ & empty:
+                continue
+            if any(self._is_attacked(pos, white, occ, opp_pawns, opp_knights, opp_diagonal, opp_straight,
+                                     opp_king_pos) for pos in safe):
+                continue
+            append(king_pos | new_pos << 6)
+
+    def piece_on_square(self, pos: int) -> Union[None, str]:
+        """
+        get the piece on the given position
+        :param pos: position of the square
+        :return: fen symbol of the piece or None if the square is empty
+        """
+        index = self._squares[pos]
+        return None if index is None else _FEN_SYMBOLS[index]
+
+    @staticmethod
+    def _is_attacked(pos: int, white: bool, occ: int, opp_pawns: int, opp_knights: int, opp_diagonal: int,
+                     opp_straight: int, opp_king_pos: int) -> bool:
+        """
+        test if a square is attacked by the opponent of the given color with the given occupancy
+        """
+        return bool(_PAWN_ATTACKS[0 if white else 1][pos] & opp_pawns or _KNIGHT_ATTACKS[pos] & opp_knights or
+                    _KING_ATTACKS[pos] >> opp_king_pos & 1 or _bishop_attacks(pos, occ) & opp_diagonal or
+                    _rook_attacks(pos, occ) & opp_straight)
+
+    def is_square_attacked(self, pos: int, white_piece: bool) -> bool:
+        """
+        test if a square is being threatened by the opponent of the given color
+        :param pos: position of the square
+        :param white_piece: point of view of the test
+        :return: whether a square is being threatened by the opponent
+        """
+        them = 6 if white_piece else 0
+        bbs = self._bbs
+        return self._is_attacked(pos, white_piece, self._occ[0] | self._occ[1], bbs[PAWN + them],
+                                 bbs[KNIGHT + them], bbs[BISHOP + them] | bbs[QUEEN + them],
+                                 bbs[ROOK + them] | bbs[QUEEN + them], _lsb(bbs[KING + them]))
+
+    def is_king_attacked(self, white_piece: bool) -> bool:
+        """
+        test if the king of the given color is attacked
+        :param white_piece: point of view of the test
+        :return: whether the king of the given color is attacked
+        """
+        return self.is_square_attacked(_lsb(self._bbs[KING if white_piece else KING + 6]), white_piece)
+
+    @contextlib.contextmanager
+    def make_move_and_undo_move_afterwards(self, move: Union[MOVE, int]) -> None:
+        """
+        make and undo the given move
+        :param move: move to make and undo
+        """
+        self.make_move(move)
+        try:
+            yield
+        finally:
+            self._undo_move()
+
+    """
+    make move
+    """
+
+    def make_move(self, move: Union[MOVE, int]) -> None:
+        """
+        make a given move
+        :param move: the move to make; either a move tuple or a packed move
+        """
+        if isinstance(move, int):
+            old_pos, new_pos, promotion = move & 63, move >> 6 & 63, packed_move.promotion_type(move)
+        else:
+            old_pos, new_pos, promotion_type = move
+            promotion = 0 if promotion_type is None else _PROMOTION_TYPES[promotion_type.lower()]
+        bbs, occ, squares = self._bbs, self._occ, self._squares
+        white = self._white_to_move
+        us, them = (0, 1) if white else (1, 0)
+        index = squares[old_pos]
+        captured = squares[new_pos]
+        capture_pos = new_pos
+        if index % 6 == PAWN and new_pos == self._ep_target_square:
+            capture_pos = new_pos - 8 if white else new_pos + 8
+            captured = squares[capture_pos]
+        self._undo_log.append((old_pos, new_pos, promotion, index, captured, capture_pos, self._castling_rights,
+                               self._ep_target_square, self._half_move_clock))
+        self._moves_log.append(move)
+        key = self._zobrist_key ^ zobrist.state_key(white, self._castling_rights, self._ep_target_square)
+        score = self._score
+
+        if captured is not None:
+            capture_bb = 1 << capture_pos
+            bbs[captured] ^= capture_bb
+            occ[them] ^= capture_bb
+            squares[capture_pos] = None
+            key ^= _PIECE_KEYS[captured][capture_pos]
+            score -= _PIECE_SCORES[captured][capture_pos]
+        move_bb = (1 << old_pos) | (1 << new_pos)
+        bbs[index] ^= move_bb
+        occ[us] ^= move_bb
+        squares[old_pos] = None
+        squares[new_pos] = index
+        key ^= _PIECE_KEYS[index][old_pos] ^ _PIECE_KEYS[index][new_pos]
+        score += _PIECE_SCORES[index][new_pos] - _PIECE_SCORES[index][old_pos]
+        if promotion:
+            promoted = promotion + (index - PAWN)
+            bbs[index] ^= 1 << new_pos
+            bbs[promoted] |= 1 << new_pos
+            squares[new_pos] = promoted
+            key ^= _PIECE_KEYS[index][new_pos] ^ _PIECE_KEYS[promoted][new_pos]
+            score += _PIECE_SCORES[promoted][new_pos] - _PIECE_SCORES[index][new_pos]
+        elif index % 6 == KING and abs(old_pos - new_pos) == 2:
+            rook_pos, new_rook_pos = (old_pos + 3, old_pos + 1) if new_pos > old_pos else (old_pos - 4, old_pos - 1)
+            rook_bb = (1 << rook_pos) | (1 << new_rook_pos)
+            rook = index - KING + ROOK
+            bbs[rook] ^= rook_bb
+            occ[us] ^= rook_bb
+            squares[new_rook_pos] = squares[rook_pos]
+            squares[rook_pos] = None
+            key ^= _PIECE_KEYS[rook][rook_pos] ^ _PIECE_KEYS[rook][new_rook_pos]
+            score += _PIECE_SCORES[rook][new_rook_pos] - _PIECE_SCORES[rook][rook_pos]
+
+        self._half_move_clock = 0 if index % 6 == PAWN or captured is not None else self._half_move_clock + 1
+        self._castling_rights &= _CASTLING_MASK[old_pos] & _CASTLING_MASK[new_pos]
+        if index % 6 == PAWN and abs(old_pos - new_pos) == 16:
+            self._ep_target_square = (old_pos + new_pos) // 2
+        else:
+            self._ep_target_square = None
+        if not white:
+            self._turn_number += 1
+        self._white_to_move = not white
+        self._zobrist_key = key ^ zobrist.state_key(not white, self._castling_rights, self._ep_target_square)
+        self._zobrist_log.append(self._zobrist_key)
+        self._score = score
+        self._score_log.append(score)
+        self._legal_moves_cache = None
+        self._packed_legal_moves_cache = None
+
+    """
+    undo move
+    """
+
+    def _undo_move(self) -> None:
+        """
+        restore the last board constellation
+        """
+        old_pos, new_pos, promotion, index, captured, capture_pos, self._castling_rights, self._ep_target_square, \
+            self._half_move_clock = self._undo_log.pop()
+        self._moves_log.pop()
+        self._zobrist_log.pop()
+        self._zobrist_key = self._zobrist_log[-1]
+        self._score_log.pop()
+        self._score = self._score_log[-1]
+        bbs, occ, squares = self._bbs, self._occ, self._squares
+        white = not self._white_to_move
+        us, them = (0, 1) if white else (1, 0)
+        if promotion:
+            bbs[squares[new_pos]] ^= 1 << new_pos
+            bbs[index] |= 1 << new_pos
+        elif index % 6 == KING and abs(old_pos - new_pos) == 2:
+            rook_pos, new_rook_pos = (old_pos + 3, old_pos + 1) if new_pos > old_pos else (old_pos - 4, old_pos - 1)
+            rook_bb = (1 << rook_pos) | (1 << new_rook_pos)
+            bbs[index - KING + ROOK] ^= rook_bb
+            occ[us] ^= rook_bb
+            squares[rook_pos] = squares[new_rook_pos]
+            squares[new_rook_pos] = None
+        move_bb = (1 << old_pos) | (1 << new_pos)
+        bbs[index] ^= move_bb
+        occ[us] ^= move_bb
+        squares[new_pos] = None
+        squares[old_pos] = index
+        if captured is not None:
+            capture_bb = 1 << capture_pos
+            bbs[captured] |= capture_bb
+            occ[them] |= capture_bb
+            squares[capture_pos] = captured
+        if not white:
+            self._turn_number -= 1
+        self._white_to_move = white
+        self._legal_moves_cache = None
+        self._packed_legal_moves_cache = None
+
+    def _get_zobrist_key(self) -> int:
+        """
+        compute the zobrist key of the current position from scratch
+        :return: zobrist key
+        """
+        return zobrist.get_key(((_FEN_SYMBOLS[index], pos) for pos, index in enumerate(self._squares)
+                                if index is not None), self._white_to_move, self._castling_rights,
+                               self._ep_target_square)
+
+    def _get_score(self) -> int:
+        """
+        compute the material and piece-square score of the current position from scratch
+        :return: score; white minus black
+        """
+        return sum(_PIECE_SCORES[index][pos] for pos, index in enumerate(self._squares) if index is not None)
+
+    """
+    fen conversion
+    """
+
+    def _load_position_from_fen(self, fen: str) -> None:
+        """
+        load the data of a fen string into the object's attributes
+        :param fen: fen string to load
+        """
+        positions, color_to_move, castling_rights, ep_target_square, half_move_clock, turn_number = \
+            fen.strip().split()
+        self._bbs = [0] * 12
+        self._squares = [None] * 64
+        for r, rank in enumerate(positions.split('/')):
+            f = 0
+            for symbol in rank:
+                if symbol.isdigit():
+                    f += int(symbol)
+                    continue
+                pos, index = (7 - r) * 8 + f, _FEN_SYMBOLS.index(symbol)
+                self._bbs[index] |= 1 << pos
+                self._squares[pos] = index
+                f += 1
+        self._occ = [self._bbs[0] | self._bbs[1] | self._bbs[2] | self._bbs[3] | self._bbs[4] | self._bbs[5],
+                     self._bbs[6] | self._bbs[7] | self._bbs[8] | self._bbs[9] | self._bbs[10] | self._bbs[11]]
+        self._white_to_move = color_to_move == 'w'
+        self._castling_rights = 0
+        for symbol, right in zip('KQkq', (_WK, _WQ, _BK, _BQ)):
+            if symbol in castling_rights:
+                self._castling_rights |= right
+        self._ep_target_square = None if ep_target_square == '-' else \
+            ((int(ep_target_square[1]) - 1) * 8) + (ord(ep_target_square[0]) - 97)
+        self._half_move_clock = int(half_move_clock)
+        self._turn_number = int(turn_number)
+
+    def _board_to_fen(self) -> str:
+        """
+        translate the board data to a fen string
+        :return: fen string of the current board
+        """
+        return f'{self._pieces_to_fen()} {self._color_to_move_to_fen()} {self._castling_rights_to_fen()} ' \
+               f'{self._ep_target_square_to_fen()} {self._half_move_clock} {self._turn_number}'
+
+    def _pieces_to_fen(self) -> str:
+        """
+        :return: fen positions
+        """
+        ranks = []
+        for rank in range(7, -1, -1):
+            positions, n_empty_squares = '', 0
+            for file in range(8):
+                index = self._squares[(rank * 8) + file]
+                if index is None:
+                    n_empty_squares += 1
+                    continue
+                if n_empty_squares:
+                    positions += str(n_empty_squares)
+                    n_empty_squares = 0
+                positions += _FEN_SYMBOLS[index]
+            if n_empty_squares:
+                positions += str(n_empty_squares)
+            ranks.append(positions)
+        return '/'.join(ranks)
+
+    def _color_to_move_to_fen(self) -> str:
+        """
+        :return: fen color to move
+        """
+        return 'w' if self._white_to_move else 'b'
+
+    def _castling_rights_to_fen(self) -> str:
+        """
+        :return: fen castling rights
+        """
+        rights = ''.join(symbol for symbol, right in zip('KQkq', (_WK, _WQ, _BK, _BQ)) if self._castling_rights & right)
+        return rights if rights else '-'
+
+    def _ep_target_square_to_fen(self) -> str:
+        """
+        :return: fen ep target square
+        """
+        if self._ep_target_square is None:
+            return '-'
+        return chr(97 + (self._ep_target_square % 8)) + str((self._ep_target_square // 8) + 1)
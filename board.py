@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import contextlib
-from typing import Tuple, Optional, Union, Set, List, TYPE_CHECKING
+from typing import Dict, Tuple, Optional, Union, Set, List, TYPE_CHECKING
 
-from pieces import Piece, Pawn, Knight, Bishop, Rook, Queen, King
+import packed_move
+import zobrist
+from pieces import Piece, Pawn, Knight, Bishop, Rook, Queen, King, DIAGONAL_DIRECTIONS, KING_TARGETS, KNIGHT_TARGETS, \
+    ORTHOGONAL_DIRECTIONS, PAWN_ATTACKS, PIECE_SQUARE_SCORES, RAYS
 
 if TYPE_CHECKING:
     from chess import MOVE
@@ -17,15 +20,20 @@ class Board:
         self._ep_target_square: Union[None, int]
         self._half_move_clock: int
         self._turn_number: int
+        self._squares: List[Union[None, Piece]]  # square-indexed mailbox; format: List[piece on square or None]
         self._load_position_from_fen(fen)
         # all board data; format: Tuple[white_to_move, castling_rights, ep_target_square, half_move_clock, turn_number
         self._data_log: List[Tuple[bool, List[bool], Union[None, int], int, int]] = []
         self._moves_log: List[MOVE] = []  # all made moves
-        # all piece positions; format Set[Tuple[fen symbol, pos]]
-        self._positions_log: List[Set[Tuple[str, int]]] = []
+        # pieces changed by a move besides the moving piece;
+        # format: Tuple[captured piece, promoted pawn, Tuple[old pos, new pos] of the castling rook]
+        self._undo_log: List[Tuple[Union[None, Piece], Union[None, Piece], Union[None, Tuple[int, int]]]] = []
         self._legal_moves_cache: Union[None, Set[MOVE]] = None
         self._active_pieces_cache: Union[None, Set[Piece]] = None
-        self._log_current_positions()
+        self._zobrist_key: int = self._get_zobrist_key()
+        self._zobrist_log: List[int] = [self._zobrist_key]  # zobrist keys of all positions
+        self._score: int = self._get_score()  # material and piece-square score; white minus black
+        self._score_log: List[int] = [self._score]  # scores of all positions
 
     def __repr__(self) -> str:
         def positions_to_str() -> str:
@@ -49,6 +57,14 @@ class Board:
     chess game data getters
     """
 
+    @property
+    def fen(self) -> str:
+        """
+        get the fen string of the current position
+        :return: fen string
+        """
+        return self._board_to_fen()
+
     @property
     def pieces(self) -> Set[Piece]:
         """
@@ -97,6 +113,14 @@ class Board:
         """
         return self._turn_number
 
+    @property
+    def zobrist_key(self) -> int:
+        """
+        get the zobrist key of the position
+        :return: 64-bit key of the pieces, color to move, castling rights and ep target square
+        """
+        return self._zobrist_key
+
     """
     board state
     """
@@ -154,23 +178,15 @@ class Board:
 
     @property
     def fivefold_repetition_rule_applies(self) -> bool:
-        def last_five_positions_are_equal() -> bool:
-            return self._positions_log[-1] == self._positions_log[-5] == self._positions_log[-9] == \
-                   self._positions_log[-13] == self._positions_log[-17]
-
-        def last_five_castling_rights_are_equal() -> bool:
-            return self._castling_rights == self._data_log[-16][1]
-
-        def last_five_ep_target_square_are_none() -> bool:
-            return self._ep_target_square is None and self._data_log[-4][2] is None and \
-                   self._data_log[-8][2] is None and self._data_log[-12][2] is None and \
-                   self._data_log[-16][2] is None
-
-        if self._turn_number < 9:
+        """
+        test if the current position occurred five times in a row every other move of the same color
+        :return: whether the fivefold repetition rule applies
+        positions are compared by their zobrist keys which include the castling rights and the ep target square
+        """
+        log = self._zobrist_log
+        if len(log) < 17:
             return False
-
-        return last_five_castling_rights_are_equal() and last_five_ep_target_square_are_none() and \
-               last_five_positions_are_equal()
+        return log[-1] == log[-5] == log[-9] == log[-13] == log[-17]
 
     @property
     def is_dead_position(self) -> bool:
@@ -219,10 +235,16 @@ class Board:
             return float('-inf')
         if self.is_draw:
             return 0
-        val = 0
-        for piece in self._active_pieces:
-            val = val + piece.pos_val if piece.white_piece == self.white_to_move else val - piece.pos_val
-        return val
+        return self.static_eval
+
+    @property
+    def static_eval(self) -> int:
+        """
+        get the material and piece-square score of the board for the color to move without detecting checkmates and
+        draws; kept up to date by make_move
+        :return: value of the board
+        """
+        return self._score if self._white_to_move else -self._score
 
     """
     legal moves
@@ -246,21 +268,110 @@ class Board:
             self._legal_moves_cache = self._get_legal_moves()
         return self._legal_moves_cache
 
-    def _get_legal_moves(self) -> Set[MOVE]:
+    @property
+    def legal_captures(self) -> Set[MOVE]:
+        """
+        get the legal captures and promotions without generating quiet moves
+        :return: legal captures and promotions
+        """
+        if self._legal_moves_cache is not None:
+            return {move for move in self._legal_moves_cache
+                    if move[2] is not None or not self.is_square_empty(move[1]) or self._is_en_passant_move(move)}
+        return self._get_legal_moves(True)
+
+    def _is_en_passant_move(self, move: MOVE) -> bool:
+        """
+        :param move: move of the color to move
+        :return: whether the move is an en passant capture
+        """
+        return move[1] == self._ep_target_square and type(self._squares[move[0]]) == Pawn
+
+    def _get_legal_moves(self, captures_only: bool = False) -> Set[MOVE]:
         """
         generate all legal moves
+        checkers and pinned pieces are computed once; only en passant captures and king moves are tested separately
+        :param captures_only: whether only captures and promotions are generated
         :return: set of all legal moves
-        NOT to be used inside the object except by _legal_moves property
+        NOT to be used inside the object except by _legal_moves and legal_captures properties
         """
-        moves = set()
+        king = self._get_king(self._white_to_move)
+        checkers, check_squares, pin_lines = self._get_checkers_and_pins(king)
+        moves = self._get_king_moves(king, captures_only)
+        if len(checkers) > 1:  # double check; only the king can move
+            return moves
         for piece in self._active_pieces:
-            if not piece.white_piece == self._white_to_move:
+            if not piece.white_piece == self._white_to_move or piece is king:
                 continue
-            for move in piece.pseudo_legal_moves:
-                if self._is_move_legal(move):
+            pin_line = pin_lines.get(piece.pos)
+            for move in piece.pseudo_legal_captures if captures_only else piece.pseudo_legal_moves:
+                if move[1] == self._ep_target_square and type(piece) == Pawn:
+                    # the captured pawn leaves its square as well; test for discovered attacks on the king
+                    if self._is_move_legal(move):
+                        moves.add(move)
+                elif (pin_line is None or move[1] in pin_line) and (not checkers or move[1] in check_squares):
+                    moves.add(move)
+        return moves
+
+    def _get_king_moves(self, king: Piece, captures_only: bool = False) -> Set[MOVE]:
+        """
+        generate all legal moves of the king; the king is removed from its square while testing the target squares so
+        that it does not block attacks along its own line
+        :param king: king of the color to move
+        :param captures_only: whether only captures are generated
+        :return: set of all legal king moves
+        """
+        moves = set()
+        self._squares[king.pos] = None
+        try:
+            for move in king.pseudo_legal_captures if captures_only else king.pseudo_legal_moves:
+                if not self.is_square_attacked(move[1], king.white_piece):
                     moves.add(move)
+        finally:
+            self._squares[king.pos] = king
         return moves
 
+    def _get_checkers_and_pins(self, king: Piece) -> Tuple[List[Piece], Set[int], Dict[int, Set[int]]]:
+        """
+        find all pieces checking the king and all pieces pinned to it
+        :param king: king of the color to move
+        :return: checking pieces, squares that capture or block a single check,
+        Dict[position of pinned piece, squares the pinned piece can move to]
+        """
+        checkers: List[Piece] = []
+        check_squares: Set[int] = set()
+        pin_lines: Dict[int, Set[int]] = {}
+        for line_attacker, diffs in ((Rook, ORTHOGONAL_DIRECTIONS), (Bishop, DIAGONAL_DIRECTIONS)):
+            for diff in diffs:
+                ray = RAYS[diff][king.pos]
+                pinned_piece: Union[None, Piece] = None
+                for n_square, pos in enumerate(ray):
+                    piece = self._squares[pos]
+                    if piece is None:
+                        continue
+                    if piece.white_piece == king.white_piece:
+                        if pinned_piece is not None:
+                            break
+                        pinned_piece = piece
+                        continue
+                    if type(piece) == line_attacker or type(piece) == Queen:
+                        if pinned_piece is None:
+                            checkers.append(piece)
+                            check_squares.update(ray[:n_square + 1])
+                        else:
+                            pin_lines[pinned_piece.pos] = set(ray[:n_square + 1])
+                    break
+        for pos in KNIGHT_TARGETS[king.pos]:
+            piece = self._squares[pos]
+            if type(piece) == Knight and not piece.white_piece == king.white_piece:
+                checkers.append(piece)
+                check_squares.add(pos)
+        for pos in PAWN_ATTACKS[king.white_piece][king.pos]:  # squares of the enemy pawns attacking the king
+            piece = self._squares[pos]
+            if type(piece) == Pawn and not piece.white_piece == king.white_piece:
+                checkers.append(piece)
+                check_squares.add(pos)
+        return checkers, check_squares, pin_lines
+
     def _is_move_legal(self, move: MOVE) -> bool:
         """
         test whether a move is legal
@@ -271,7 +382,7 @@ class Board:
             return not self.is_king_attacked(not self._white_to_move)  # color to move changed after move
 
     @contextlib.contextmanager
-    def make_move_and_undo_move_afterwards(self, move: MOVE) -> None:
+    def make_move_and_undo_move_afterwards(self, move: Union[MOVE, int]) -> None:
         """
         make and undo the given move
         :param move: move to make and undo
@@ -292,23 +403,27 @@ class Board:
     make move
     """
 
-    def make_move(self, move: MOVE) -> None:
+    def make_move(self, move: Union[MOVE, int]) -> None:
         """
         make a given move
-        :param move: the move to make
+        :param move: the move to make; either a move tuple or a packed move
         """
+        move = packed_move.to_tuple(move)
         moving_piece = self._get_piece(move[0])
         self._log_current_data()
         self._log_current_move(move)
         self._adjust_half_move_clock(moving_piece, move)
-        self._move_pieces(moving_piece, move)
+        self._zobrist_key ^= self._get_state_zobrist_key()
+        self._log_undo_record(self._move_pieces(moving_piece, move))
         self._clear_active_pieces_cache()
         self._adjust_castling_rights()
         self._set_en_passant_target_square(moving_piece, move)
         self._increase_turn_number()
         self._alternate_color_to_move()
+        self._zobrist_key ^= self._get_state_zobrist_key()
         self._clear_legal_moves_cache()
-        self._log_current_positions()
+        self._log_current_zobrist_key()
+        self._log_current_score()
 
     def _adjust_half_move_clock(self, moving_piece: Piece, move: MOVE) -> None:
         """
@@ -321,49 +436,61 @@ class Board:
         else:
             self._half_move_clock += 1
 
-    def _move_pieces(self, moving_piece: Piece, move: MOVE) -> None:
+    def _move_pieces(self, moving_piece: Piece, move: MOVE) \
+            -> Tuple[Union[None, Piece], Union[None, Piece], Union[None, Tuple[int, int]]]:
         """
         move all pieces according the move
         :param moving_piece: piece to move
         :param move: move to make
+        :return: undo record; format: Tuple[captured piece, promoted pawn, Tuple[old pos, new pos] of the castling rook]
         """
 
-        def capture_piece() -> None:
-            with contextlib.suppress(ValueError):
-                self._get_piece(move[1]).capture(self._turn_number, self._white_to_move)
+        def capture_piece() -> Union[None, Piece]:
+            if self._squares[move[1]] is None:
+                return None
+            captured_piece = self._remove_piece_from_square(move[1])
+            captured_piece.capture(self._turn_number, self._white_to_move)
+            return captured_piece
 
-        def move_castling_rook() -> None:
-            if type(moving_piece) == King and abs(move[0] - move[1]) == 2:
-                # castles queenside
-                if (move[0] - move[1]) == abs(move[0] - move[1]):
-                    # move queenside rook
-                    self._get_piece(move[0] - 4).move_to(move[1] + 1)
-                # castles kingside
-                else:
-                    # move queenside rook
-                    self._get_piece(move[0] + 3).move_to(move[1] - 1)
+        def move_castling_rook() -> Union[None, Tuple[int, int]]:
+            if not type(moving_piece) == King or not abs(move[0] - move[1]) == 2:
+                return None
+            if (move[0] - move[1]) == abs(move[0] - move[1]):  # castles queenside
+                rook_move = (move[0] - 4, move[1] + 1)
+            else:  # castles kingside
+                rook_move = (move[0] + 3, move[1] - 1)
+            self._move_piece_on_squares(*rook_move)
+            return rook_move
 
-        def capture_pawn_en_passant() -> None:
-            if move[1] == self._ep_target_square and type(moving_piece) == Pawn:
-                # remove piece from piece set
-                self._get_piece(move[0] - ((move[0] % 8) - (move[1] % 8))).capture(self._turn_number,
-                                                                                   self._white_to_move)
+        def capture_pawn_en_passant() -> Union[None, Piece]:
+            if not move[1] == self._ep_target_square or not type(moving_piece) == Pawn:
+                return None
+            captured_pawn = self._remove_piece_from_square(move[0] - ((move[0] % 8) - (move[1] % 8)))
+            captured_pawn.capture(self._turn_number, self._white_to_move)
+            return captured_pawn
 
         def move_piece() -> None:
-            moving_piece.move_to(move[1])
+            self._move_piece_on_squares(move[0], move[1])
 
-        def promote_pawn() -> None:
-            nonlocal moving_piece
+        def promote_pawn() -> Union[None, Piece]:
             if move[2] is None:  # no promotion move
-                return
+                return None
             moving_piece.promote(self._turn_number, self._white_to_move)
-            self._pieces.add(self._create_piece(moving_piece.pos, move[2]))
-
-        capture_piece()
-        move_castling_rook()
-        capture_pawn_en_passant()
+            promoted_piece = self._create_piece(moving_piece.pos, move[2])
+            self._pieces.add(promoted_piece)
+            self._squares[promoted_piece.pos] = promoted_piece
+            self._zobrist_key ^= zobrist.PIECE_KEYS[moving_piece.fen_symbol][promoted_piece.pos] ^ \
+                zobrist.PIECE_KEYS[promoted_piece.fen_symbol][promoted_piece.pos]
+            self._score += PIECE_SQUARE_SCORES[promoted_piece.fen_symbol][promoted_piece.pos] - \
+                PIECE_SQUARE_SCORES[moving_piece.fen_symbol][promoted_piece.pos]
+            return moving_piece
+
+        captured = capture_piece()
+        castling_rook_move = move_castling_rook()
+        if captured is None:
+            captured = capture_pawn_en_passant()
         move_piece()
-        promote_pawn()
+        return captured, promote_pawn(), castling_rook_move
 
     def _adjust_castling_rights(self) -> None:
         """
@@ -426,47 +553,43 @@ class Board:
         moved_piece = self._get_piece(move[1])
         self._white_to_move = data[0]
         self._turn_number = data[4]
-        self._undo_piece_moves(move, moved_piece)
+        self._undo_piece_moves(move, moved_piece, self._load_last_undo_record())
         self._castling_rights = data[1]
         self._ep_target_square = data[2]
         self._half_move_clock = data[3]
         self._clear_legal_moves_cache()
         self._clear_active_pieces_cache()
-        self._remove_last_positions()
+        self._remove_last_zobrist_key()
+        self._remove_last_score()
 
-    def _undo_piece_moves(self, move: MOVE, moved_piece: Piece) -> None:
+    def _undo_piece_moves(self, move: MOVE, moved_piece: Piece,
+                          undo_record: Tuple[Union[None, Piece], Union[None, Piece], Union[None, Tuple[int, int]]]) \
+            -> None:
         """
         restore the last piece positions
         :param move: move to undo
         :param moved_piece: piece to move back
+        :param undo_record: format: Tuple[captured piece, promoted pawn, Tuple[old pos, new pos] of the castling rook]
         """
+        captured_piece, promoted_pawn, castling_rook_move = undo_record
 
         def uncastle() -> None:
-            if not type(moved_piece) == King or not abs(move[0] - move[1]) == 2:
-                return
-            if (move[0] - move[1]) == abs(move[0] - move[1]):  # castles queenside
-                self._get_piece(move[1] + 1).move_to(move[1] - 2)  # move queenside rook
-            else:  # castles kingside
-                self._get_piece(move[1] - 1).move_to(move[1] + 1)  # move queenside rook
+            if castling_rook_move is not None:
+                self._move_piece_on_squares(castling_rook_move[1], castling_rook_move[0])
 
         def unpromote() -> None:
-            nonlocal moved_piece
-            for piece in self._pieces:
-                with contextlib.suppress(AttributeError):
-                    if piece.promotion_data == (self._turn_number, self._white_to_move):
-                        self._pieces.discard(moved_piece)
-                        piece.unpromote()
-                        moved_piece = piece
-                        return
+            if promoted_pawn is not None:
+                self._pieces.discard(moved_piece)
+                promoted_pawn.unpromote()
+                self._squares[move[1]] = promoted_pawn
 
         def move_piece() -> None:
-            moved_piece.move_to(move[0])
+            self._move_piece_on_squares(move[1], move[0])
 
         def uncapture() -> None:
-            for piece in self._pieces:
-                if piece.capture_data == (self._turn_number, self._white_to_move):
-                    piece.uncapture()
-                    return
+            if captured_piece is not None:
+                captured_piece.uncapture()
+                self._squares[captured_piece.pos] = captured_piece
 
         uncastle()
         unpromote()
@@ -481,11 +604,11 @@ class Board:
         """
         test whether there is a piece on the given position
         :param pos: position of the square to test
-        :param pieces: piece set to search
+        :param pieces: piece set to search; the squares table is used if none is given
         :return: whether there is a piece at the given position
         """
         if pieces is None:
-            pieces = self._active_pieces
+            return self._squares[pos] is None
         for piece in pieces:
             if piece.pos == pos:
                 return False
@@ -498,10 +621,8 @@ class Board:
         :param white_piece: own color
         :return: whether there is one of your own pieces at the given position
         """
-        for piece in self._active_pieces:
-            if piece.pos == pos and piece.white_piece == white_piece:
-                return True
-        return False
+        piece = self._squares[pos]
+        return piece is not None and piece.white_piece == white_piece
 
     def opponent_piece_on_square(self, pos: int, white_piece: bool) -> bool:
         """
@@ -510,12 +631,19 @@ class Board:
         :param white_piece: own color
         :return: whether there is one of your opponent's own pieces at the given position
         """
-        for piece in self._active_pieces:
-            if piece.pos == pos and not piece.white_piece == white_piece:
-                return True
-        return False
+        piece = self._squares[pos]
+        return piece is not None and not piece.white_piece == white_piece
 
-    def is_square_attacked(self, pos: int, white_piece: bool):
+    def piece_on_square(self, pos: int) -> Union[None, str]:
+        """
+        get the piece on the given position
+        :param pos: position of the square
+        :return: fen symbol of the piece or None if the square is empty
+        """
+        piece = self._squares[pos]
+        return None if piece is None else piece.fen_symbol
+
+    def is_square_attacked(self, pos: int, white_piece: bool) -> bool:
         """
         test if a square is being threatened by a player
         only considers moves that could threaten the king
@@ -523,9 +651,22 @@ class Board:
         :param white_piece: point of view of the test
         :return: whether a square is being threatened by a player
         """
-        for piece in self._active_pieces:
-            if not piece.white_piece == white_piece:
-                if pos in piece.attacking_squares:
+        squares = self._squares
+        for line_attacker, diffs in ((Rook, ORTHOGONAL_DIRECTIONS), (Bishop, DIAGONAL_DIRECTIONS)):
+            for diff in diffs:
+                for square in RAYS[diff][pos]:
+                    piece = squares[square]
+                    if piece is None:
+                        continue
+                    if not piece.white_piece == white_piece and (type(piece) == line_attacker or type(piece) == Queen):
+                        return True
+                    break
+        # a pawn attacks pos from the squares a pawn of the other color on pos would attack
+        for attacker_type, attacker_squares in ((Knight, KNIGHT_TARGETS[pos]), (King, KING_TARGETS[pos]),
+                                                (Pawn, PAWN_ATTACKS[white_piece][pos])):
+            for square in attacker_squares:
+                piece = squares[square]
+                if type(piece) == attacker_type and not piece.white_piece == white_piece:
                     return True
         return False
 
@@ -569,12 +710,15 @@ class Board:
         """
         get the piece on the given position
         :param pos: positions of the piece
-        :param pieces: piece set to use
+        :param pieces: piece set to use; the squares table is used if none is given
         :return: the piece on the given position
         :raises ValueError if there is no piece on the square
         """
         if pieces is None:
-            pieces = self._active_pieces
+            piece = self._squares[pos]
+            if piece is None:
+                raise ValueError('No piece found on given position.')
+            return piece
         for piece in pieces:
             if piece.pos == pos:
                 return piece
@@ -591,6 +735,34 @@ class Board:
                 return piece
         raise ValueError('No king found.')
 
+    def _move_piece_on_squares(self, old_pos: int, new_pos: int) -> None:
+        """
+        move the piece on the given position to a new position and keep the squares table up to date
+        :param old_pos: position of the piece to move
+        :param new_pos: position to move the piece to
+        """
+        piece = self._squares[old_pos]
+        self._squares[old_pos] = None
+        self._squares[new_pos] = piece
+        piece.move_to(new_pos)
+        keys = zobrist.PIECE_KEYS[piece.fen_symbol]
+        self._zobrist_key ^= keys[old_pos] ^ keys[new_pos]
+        scores = PIECE_SQUARE_SCORES[piece.fen_symbol]
+        self._score += scores[new_pos] - scores[old_pos]
+
+    def _remove_piece_from_square(self, pos: int) -> Piece:
+        """
+        remove the piece on the given position from the squares table
+        :param pos: position of the piece
+        :return: the removed piece
+        :raises ValueError if there is no piece on the square
+        """
+        piece = self._get_piece(pos)
+        self._squares[pos] = None
+        self._zobrist_key ^= zobrist.PIECE_KEYS[piece.fen_symbol][pos]
+        self._score -= PIECE_SQUARE_SCORES[piece.fen_symbol][pos]
+        return piece
+
     def _create_piece(self, pos: int, symbol: str) -> Piece:
         """
         create a piece object
@@ -631,6 +803,21 @@ class Board:
         """
         return self._data_log.pop()
 
+    def _log_undo_record(self, undo_record: Tuple[Union[None, Piece], Union[None, Piece],
+                                                  Union[None, Tuple[int, int]]]) -> None:
+        """
+        save the pieces changed by the last move
+        :param undo_record: format: Tuple[captured piece, promoted pawn, Tuple[old pos, new pos] of the castling rook]
+        """
+        self._undo_log.append(undo_record)
+
+    def _load_last_undo_record(self) -> Tuple[Union[None, Piece], Union[None, Piece], Union[None, Tuple[int, int]]]:
+        """
+        load the pieces changed by the last move
+        :return: captured piece, promoted pawn, Tuple[old pos, new pos] of the castling rook
+        """
+        return self._undo_log.pop()
+
     def _log_current_move(self, move: MOVE) -> None:
         """
         save the last move
@@ -644,20 +831,54 @@ class Board:
         """
         return self._moves_log.pop()
 
-    def _log_current_positions(self) -> None:
+    def _log_current_zobrist_key(self) -> None:
         """
-        save the positions of all active pieces
+        save the zobrist key of the current position
         """
-        positions = set()
-        for piece in self._active_pieces:
-            positions.add((piece.fen_symbol, piece.pos))
-        self._positions_log.append(positions)
+        self._zobrist_log.append(self._zobrist_key)
+
+    def _remove_last_zobrist_key(self) -> None:
+        """
+        remove the last object of the zobrist log and restore the key of the previous position
+        """
+        self._zobrist_log.pop()
+        self._zobrist_key = self._zobrist_log[-1]
+
+    def _get_zobrist_key(self) -> int:
+        """
+        compute the zobrist key of the current position from scratch
+        :return: zobrist key
+        """
+        return zobrist.get_key(((piece.fen_symbol, piece.pos) for piece in self._active_pieces), self._white_to_move,
+                               zobrist.castling_rights_to_index(self._castling_rights), self._ep_target_square)
+
+    def _log_current_score(self) -> None:
+        """
+        save the score of the current position
+        """
+        self._score_log.append(self._score)
+
+    def _remove_last_score(self) -> None:
+        """
+        remove the last object of the score log and restore the score of the previous position
+        """
+        self._score_log.pop()
+        self._score = self._score_log[-1]
+
+    def _get_score(self) -> int:
+        """
+        compute the material and piece-square score of the current position from scratch
+        :return: score; white minus black
+        """
+        return sum(PIECE_SQUARE_SCORES[piece.fen_symbol][piece.pos] for piece in self._active_pieces)
 
-    def _remove_last_positions(self) -> None:
+    def _get_state_zobrist_key(self) -> int:
         """
-        remove the last object of the positions log
+        get the part of the zobrist key that does not depend on the pieces
+        :return: key of the color to move, castling rights and ep target square
         """
-        self._positions_log.pop()
+        return zobrist.state_key(self._white_to_move, zobrist.castling_rights_to_index(self._castling_rights),
+                                 self._ep_target_square)
 
     def _load_position_from_fen(self, fen: str) -> None:
         """
@@ -667,6 +888,7 @@ class Board:
         """
         self._pieces, self._white_to_move, self._castling_rights, self._ep_target_square, self._half_move_clock, \
             self._turn_number = self._fen_to_board(fen)
+        self._squares = self._pieces_to_squares(self._pieces)
 
     """
     board conversion
@@ -703,6 +925,18 @@ class Board:
                 f += 1
         return pieces
 
+    @staticmethod
+    def _pieces_to_squares(pieces: Set[Piece]) -> List[Union[None, Piece]]:
+        """
+        convert a piece set to a square-indexed list of pieces
+        :param pieces: set of pieces on the board
+        :return: list with the piece on every square or None if the square is empty
+        """
+        squares: List[Union[None, Piece]] = [None] * 64
+        for piece in pieces:
+            squares[piece.pos] = piece
+        return squares
+
     @staticmethod
     def _color_to_move_to_board(color_to_move: str) -> bool:
         """
@@ -777,11 +1011,9 @@ class Board:
     def _pieces_to_fen(self, pieces: Set[Piece] = None) -> str:
         """
         convert positions from board object data to fen data
-        :param pieces: board object piece set
+        :param pieces: board object piece set; the squares table is used if none is given
         :return: fen positions
         """
-        if pieces is None:
-            pieces = self._active_pieces
         positions = ''
         for rank in range(7, -1, -1):
             n_empty_squares = 0
@@ -35,7 +35,21 @@ class Game:
             if input_ == 'y':
                 return HumanPlayer(color == 'white', input(f'> Enter the name of the {color} human player: '))
             elif input_ == 'n':
-                return ComPlayer(color == 'white')
+                return ComPlayer(color == 'white', Game._select_com_mode(color))
+
+    @staticmethod
+    def _select_com_mode(color: str) -> str:
+        """
+        let the user select how the com player selects its moves
+        :param color: need to be "white" if player is supposed to be white otherwise "black"
+        :return: ComPlayer.RANDOM or ComPlayer.SEARCH
+        """
+        while True:
+            input_ = input(f'> Should the {color} com player [r]andomly select or [s]earch its moves?: ')
+            if input_ == 'r':
+                return ComPlayer.RANDOM
+            elif input_ == 's':
+                return ComPlayer.SEARCH
 
     def _init_board(self) -> None:
         """
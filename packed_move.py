@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Dict, TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from chess import MOVE
+
+"""
+compact integer representation of a move
+bits 0-5: starting square, bits 6-11: target square, bits 12-14: promotion type (0: none, 1: knight, 2: bishop,
+3: rook, 4: queen), bit 15: black promotion
+"""
+
+FROM_MASK: int = 0x3F
+TO_SHIFT: int = 6
+PROMOTION_SHIFT: int = 12
+PROMOTION_TYPE_MASK: int = 0x7
+BLACK_PROMOTION_FLAG: int = 1 << 15
+
+# format: Dict[promotion symbol, promotion bits]
+PROMOTION_BITS: Dict[str, int] = {'N': 1 << PROMOTION_SHIFT, 'B': 2 << PROMOTION_SHIFT, 'R': 3 << PROMOTION_SHIFT,
+                                  'Q': 4 << PROMOTION_SHIFT}
+PROMOTION_BITS.update({symbol.lower(): bits | BLACK_PROMOTION_FLAG for symbol, bits in PROMOTION_BITS.items()})
+# format: Dict[promotion bits, promotion symbol]
+_PROMOTION_SYMBOLS: Dict[int, str] = {bits: symbol for symbol, bits in PROMOTION_BITS.items()}
+
+
+def encode(move: MOVE) -> int:
+    """
+    convert a move tuple to its packed form
+    :param move: format: Tuple[starting square, target square, promotion symbol or None]
+    :return: packed move
+    """
+    packed = move[0] | (move[1] << TO_SHIFT)
+    if move[2] is not None:
+        packed |= PROMOTION_BITS[move[2]]
+    return packed
+
+
+def decode(move: int) -> MOVE:
+    """
+    convert a packed move to the tuple form
+    :param move: packed move
+    :return: format: Tuple[starting square, target square, promotion symbol or None]
+    """
+    return move & FROM_MASK, (move >> TO_SHIFT) & FROM_MASK, promotion_symbol(move)
+
+
+def to_tuple(move: Union[MOVE, int]) -> MOVE:
+    """
+    get the tuple form of a move in any representation
+    :param move: move tuple or packed move
+    :return: move tuple
+    """
+    return decode(move) if isinstance(move, int) else move
+
+
+def from_square(move: int) -> int:
+    """
+    :param move: packed move
+    :return: starting square of the move
+    """
+    return move & FROM_MASK
+
+
+def to_square(move: int) -> int:
+    """
+    :param move: packed move
+    :return: target square of the move
+    """
+    return (move >> TO_SHIFT) & FROM_MASK
+
+
+def promotion_type(move: int) -> int:
+    """
+    :param move: packed move
+    :return: type of the piece the pawn promotes to; 0: no promotion, 1: knight, 2: bishop, 3: rook, 4: queen
+    """
+    return (move >> PROMOTION_SHIFT) & PROMOTION_TYPE_MASK
+
+
+def promotion_symbol(move: int) -> Union[None, str]:
+    """
+    :param move: packed move
+    :return: symbol of the piece the pawn promotes to or None
+    """
+    return _PROMOTION_SYMBOLS.get(move >> PROMOTION_SHIFT << PROMOTION_SHIFT)
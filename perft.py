@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
+
+from bitboard import BitBoard
+from board import Board
+from player import Player
+from transposition import EXACT, TranspositionTable
+
+if TYPE_CHECKING:
+    from chess import MOVE
+
+"""
+perft: count the leaf nodes of the legal move tree of a position to validate the move generation
+usage: python perft.py [--fen FEN] [--depth DEPTH] [--jobs N] [--split-depth {1,2}] [--bitboard]
+       [--mode {plain,bulk,hashed,detailed}] [--reference FILE | --reference-board {board,bitboard}]
+"""
+
+BOARD_TYPES: Dict[str, type] = {'board': Board, 'bitboard': BitBoard}
+
+# perft modes
+PLAIN: str = 'plain'  # make every move down to the leaves
+BULK: str = 'bulk'  # count the legal moves at the last ply instead of making them
+HASHED: str = 'hashed'  # bulk counting; the node counts of subtrees are memoized by zobrist key and depth
+MODES: Tuple[str, ...] = (PLAIN, BULK, HASHED)
+
+# counters of perft_details in the order of the reference perft tables
+DETAIL_NAMES: Tuple[str, ...] = ('nodes', 'captures', 'en_passant', 'castles', 'promotions', 'checks', 'checkmates')
+
+# mixed into the zobrist key so that the node counts of one position at different depths do not replace each other
+_random = random.Random(0xDE97)
+_DEPTH_KEYS: List[int] = [_random.getrandbits(64) for _ in range(64)]
+
+
+# if board.checkmate or board.stalemate return 0 or len(board.legal_moves)
+def perft_legal_moves(board: Union[Board, BitBoard], depth: int, tt: Optional[TranspositionTable] = None,
+                      bulk: bool = True) -> int:
+    """
+    count the leaf nodes of the legal move tree
+    :param board: board to count the nodes of
+    :param depth: depth of the tree
+    :param tt: if given, the node counts of subtrees are stored by zobrist key and depth and reused for transpositions
+    :param bulk: whether the legal moves at the last ply are counted instead of made
+    :return: number of leaf nodes
+    """
+    if depth == 0:
+        return 1
+    if depth == 1 and bulk:
+        return len(board.legal_moves)
+    if tt is not None:
+        key = board.zobrist_key ^ _DEPTH_KEYS[depth & 63]
+        entry = tt.probe(key)
+        if entry is not None and entry[1] == depth:
+            return entry[3]
+    nodes: int = 0
+    for move in board.legal_moves:
+        with board.make_move_and_undo_move_afterwards(move):
+            nodes += perft_legal_moves(board, depth - 1, tt, bulk)
+    if tt is not None:
+        tt.store(key, depth, EXACT, nodes, None)
+    return nodes
+
+
+def perft(board: Union[Board, BitBoard], depth: int, mode: str = BULK, hash_size_mb: float = 16) -> int:
+    """
+    count the leaf nodes of the legal move tree in the given mode
+    :param board: board to count the nodes of
+    :param depth: depth of the tree
+    :param mode: PLAIN, BULK or HASHED
+    :param hash_size_mb: memory cap of the table used in HASHED mode
+    :return: number of leaf nodes
+    :raises ValueError if the mode is unknown
+    """
+    if mode == PLAIN:
+        return perft_legal_moves(board, depth, bulk=False)
+    if mode == BULK:
+        return perft_legal_moves(board, depth)
+    if mode == HASHED:
+        return perft_legal_moves(board, depth, TranspositionTable(hash_size_mb))
+    raise ValueError(f'Unknown perft mode: {mode}.')
+
+
+def perft_details(board: Union[Board, BitBoard], depth: int) -> Dict[str, int]:
+    """
+    count the leaf nodes of the legal move tree and classify the moves of the last ply like the reference perft tables
+    :param board: board to count the nodes of
+    :param depth: depth of the tree
+    :return: format: Dict[name of DETAIL_NAMES, count]
+    """
+    details = dict.fromkeys(DETAIL_NAMES, 0)
+    if depth == 0:
+        details['nodes'] = 1
+    else:
+        _add_details(board, depth, details)
+    return details
+
+
+def _add_details(board: Union[Board, BitBoard], depth: int, details: Dict[str, int]) -> None:
+    """
+    add the counts of the subtree to the details
+    :param board: board to count the nodes of
+    :param depth: remaining depth of the tree; at least 1
+    :param details: format: Dict[name of DETAIL_NAMES, count]
+    """
+    if depth > 1:
+        for move in board.legal_moves:
+            with board.make_move_and_undo_move_afterwards(move):
+                _add_details(board, depth - 1, details)
+        return
+    for move in board.legal_moves:
+        piece = board.piece_on_square(move[0]).upper()
+        details['nodes'] += 1
+        if board.piece_on_square(move[1]) is not None:
+            details['captures'] += 1
+        elif piece == 'P' and move[1] == board.ep_target_square:
+            details['captures'] += 1
+            details['en_passant'] += 1
+        if piece == 'K' and abs(move[0] - move[1]) == 2:
+            details['castles'] += 1
+        if move[2] is not None:
+            details['promotions'] += 1
+        with board.make_move_and_undo_move_afterwards(move):
+            if board.is_king_attacked(board.white_to_move):
+                details['checks'] += 1
+                if not board.legal_moves:
+                    details['checkmates'] += 1
+
+
+"""
+parallel perft
+"""
+
+
+def divide(fen: str, depth: int, jobs: int = 1, split_depth: int = 1, board_type: str = 'board', mode: str = BULK) \
+        -> Dict[MOVE, int]:
+    """
+    count the leaf nodes below every root move; the subtrees are counted in a process pool
+    :param fen: position to count the nodes of
+    :param depth: depth of the tree
+    :param jobs: number of worker processes
+    :param split_depth: 1 to distribute the root moves, 2 to distribute the replies to every root move
+    :param board_type: 'board' or 'bitboard'
+    :param mode: PLAIN, BULK or HASHED; every task uses its own table in HASHED mode
+    :return: Dict[root move, number of leaf nodes below the move]
+    """
+    if depth < 1:
+        raise ValueError('Depth must be at least 1.')
+    board = BOARD_TYPES[board_type](fen)
+    # format: List[Tuple[root move, fen of the position to count, remaining depth]]
+    tasks: List[Tuple[MOVE, str, int]] = []
+    for move in board.legal_moves:
+        with board.make_move_and_undo_move_afterwards(move):
+            if split_depth > 1 and depth > 2:
+                for reply in board.legal_moves:
+                    with board.make_move_and_undo_move_afterwards(reply):
+                        tasks.append((move, board.fen, depth - 2))
+            else:
+                tasks.append((move, board.fen, depth - 1))
+    counts: Dict[MOVE, int] = {move: 0 for move in board.legal_moves}
+    args = [(fen_, depth_, board_type, mode) for _, fen_, depth_ in tasks]
+    if jobs > 1 and len(tasks) > 1:
+        with multiprocessing.Pool(jobs) as pool:
+            results = pool.map(_count_nodes, args, chunksize=max(1, len(args) // (4 * jobs)))
+    else:
+        results = [_count_nodes(arg) for arg in args]
+    for (move, _, _), nodes in zip(tasks, results):
+        counts[move] += nodes
+    return counts
+
+
+def _count_nodes(task: Tuple[str, int, str, str]) -> int:
+    """
+    worker function; rebuilds the board from its fen
+    :param task: format: Tuple[fen, depth, board type, perft mode]
+    :return: number of leaf nodes
+    """
+    fen, depth, board_type, mode = task
+    return perft(BOARD_TYPES[board_type](fen), depth, mode)
+
+
+"""
+bug localization
+"""
+
+# kinds of divergences from the reference
+MISSING: str = 'missing'  # the reference has a move the move generation does not generate
+EXTRA: str = 'extra'  # the move generation generates a move the reference does not have
+NO_REFERENCE: str = 'no reference'  # the counts differ but the reference has no divide of the position to go deeper
+
+# format: Dict[Tuple[position key, depth], Dict[move in lower case coordinate notation, number of leaf nodes]]
+REFERENCE = Dict[Tuple[str, int], Dict[str, int]]
+# format: Tuple[moves from the root to the diverging position, fen of the diverging position, diverging move, kind]
+DIVERGENCE = Tuple[List[str], str, Union[None, str], str]
+
+
+def load_reference(path: str) -> REFERENCE:
+    """
+    load reference divides from a file in the format of a uci perft session, e.g.:
+        position fen 8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1
+        go perft 2
+        a5a4: 15
+        ...
+    "position startpos" is accepted as well; all other lines are ignored
+    :param path: path of the reference file
+    :return: format: Dict[Tuple[position key, depth], Dict[move, number of leaf nodes]]
+    """
+    reference: REFERENCE = {}
+    counts: Union[None, Dict[str, int]] = None
+    fen = Board().fen
+    with open(path) as file:
+        for line in file:
+            words = line.split()
+            if words[:2] == ['position', 'startpos']:
+                fen = Board().fen
+            elif words[:2] == ['position', 'fen']:
+                fen = ' '.join(words[2:])
+            elif words[:2] == ['go', 'perft']:
+                counts = reference.setdefault((_position_key(fen), int(words[2])), {})
+            elif counts is not None and len(words) == 2 and words[0].endswith(':') and words[1].isdigit():
+                counts[words[0][:-1].lower()] = int(words[1])
+    return reference
+
+
+def _position_key(fen: str) -> str:
+    """
+    :param fen: fen string
+    :return: fen without the move counters
+    """
+    return ' '.join(fen.split()[:4])
+
+
+def reference_from_file(path: str) -> Callable[[str, int], Union[None, Dict[str, int]]]:
+    """
+    :param path: path of a reference file; see load_reference
+    :return: function that returns the reference divide of a fen and depth or None if the file has no such divide
+    """
+    reference = load_reference(path)
+    return lambda fen, depth: reference.get((_position_key(fen), depth))
+
+
+def reference_from_engine(board_type: str) -> Callable[[str, int], Union[None, Dict[str, int]]]:
+    """
+    :param board_type: 'board' or 'bitboard'; the engine to compare with
+    :return: function that returns the divide of a fen and depth counted with the given engine
+    """
+    return lambda fen, depth: {move_to_str(move).lower(): nodes
+                               for move, nodes in divide(fen, depth, board_type=board_type).items()}
+
+
+def localize_bug(fen: str, depth: int, reference: Callable[[str, int], Union[None, Dict[str, int]]],
+                 board_type: str = 'board', jobs: int = 1) -> Union[None, DIVERGENCE]:
+    """
+    compare the divide of a position with a reference and descend into the first move with a wrong count until the
+    position is found whose legal moves differ from the reference
+    :param fen: position to start from
+    :param depth: depth of the tree
+    :param reference: returns the reference divide of a fen and depth or None if unknown
+    :param board_type: 'board' or 'bitboard'; the engine to test
+    :param jobs: number of worker processes of every divide
+    :return: format: Tuple[moves from the root, fen of the diverging position, diverging move, MISSING, EXTRA or
+        NO_REFERENCE]; None if the counts equal the reference
+    """
+    moves: List[str] = []
+    while True:
+        counts = {move_to_str(move).lower(): nodes for move, nodes in divide(fen, depth, jobs,
+                                                                             board_type=board_type).items()}
+        expected = reference(fen, depth)
+        if expected is None:
+            return moves, fen, None, NO_REFERENCE
+        missing_moves, extra_moves = sorted(expected.keys() - counts.keys()), sorted(counts.keys() - expected.keys())
+        if missing_moves:
+            return moves, fen, missing_moves[0], MISSING
+        if extra_moves:
+            return moves, fen, extra_moves[0], EXTRA
+        wrong_moves = sorted(move for move in counts if not counts[move] == expected[move])
+        if not wrong_moves:
+            return None
+        board = BOARD_TYPES[board_type](fen)
+        board.make_move(next(move for move in board.legal_moves if move_to_str(move).lower() == wrong_moves[0]))
+        moves.append(wrong_moves[0])
+        fen = board.fen
+        depth -= 1
+
+
+def move_to_str(move: MOVE) -> str:
+    """
+    convert a move to coordinate notation
+    :param move: move to convert
+    :return: e.g. "e2e4" or "a7a8Q"
+    """
+    return Player._pos_to_str(move[0]) + Player._pos_to_str(move[1]) + (move[2] or '')
+
+
+def _main() -> None:
+    parser = argparse.ArgumentParser(description='Count the leaf nodes of the legal move tree of a position.')
+    parser.add_argument('--fen', default='rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--jobs', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--split-depth', type=int, choices=(1, 2), default=1,
+                        help='distribute the root moves (1) or the replies to the root moves (2) across the workers')
+    parser.add_argument('--bitboard', action='store_true', help='use the bitboard engine')
+    parser.add_argument('--mode', choices=MODES + ('detailed',), default=BULK,
+                        help='counting mode; detailed prints the reference table of every depth instead of divide')
+    reference = parser.add_mutually_exclusive_group()
+    reference.add_argument('--reference', help='file with reference divides to localize a wrong count')
+    reference.add_argument('--reference-board', choices=tuple(BOARD_TYPES),
+                           help='engine whose counts are the reference to localize a wrong count')
+    args = parser.parse_args()
+    board_type = 'bitboard' if args.bitboard else 'board'
+
+    if args.mode == 'detailed':
+        _print_details(args.fen, args.depth, board_type)
+        return
+    start = time.perf_counter()
+    counts = divide(args.fen, args.depth, args.jobs, args.split_depth, board_type, args.mode)
+    elapsed = time.perf_counter() - start
+    for move_str, nodes in sorted((move_to_str(move), nodes) for move, nodes in counts.items()):
+        print(f'{move_str}: {nodes}')
+    total = sum(counts.values())
+    print(f'\nNodes searched: {total}\nTime: {elapsed:.3f} s\nNodes per second: {int(total / max(elapsed, 1e-9))}')
+    if args.reference or args.reference_board:
+        _print_divergence(localize_bug(args.fen, args.depth, reference_from_file(args.reference) if args.reference
+                                       else reference_from_engine(args.reference_board), board_type, args.jobs))
+
+
+def _print_details(fen: str, depth: int, board_type: str) -> None:
+    """
+    print the detailed counts of every depth up to the given depth as table
+    :param fen: position to count the nodes of
+    :param depth: greatest depth
+    :param board_type: 'board' or 'bitboard'
+    """
+    print('depth ' + ' '.join(f'{name:>12}' for name in DETAIL_NAMES))
+    for depth_ in range(1, depth + 1):
+        details = perft_details(BOARD_TYPES[board_type](fen), depth_)
+        print(f'{depth_:>5} ' + ' '.join(f'{details[name]:>12}' for name in DETAIL_NAMES))
+
+
+def _print_divergence(divergence: Union[None, DIVERGENCE]) -> None:
+    """
+    print the result of localize_bug
+    :param divergence: format: Tuple[moves from the root, fen, move, kind] or None
+    """
+    if divergence is None:
+        print('\nAll counts equal the reference.')
+        return
+    moves, fen, move, kind = divergence
+    print(f'\nDivergence after moves: {" ".join(moves) or "-"}\nFEN: {fen}')
+    if kind == MISSING:
+        print(f'Move {move} of the reference is not generated.')
+    elif kind == EXTRA:
+        print(f'Move {move} is generated but not in the reference.')
+    else:
+        print('The reference has no divide of this position.')
+
+
+if __name__ == '__main__':
+    _main()
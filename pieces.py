@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Dict, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING, Union
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING, Union
 
 if TYPE_CHECKING:
     from board import Board, MOVE
@@ -12,9 +12,51 @@ https://www.chessprogramming.org/Simplified_Evaluation_Function
 """
 
 
+def _jump_targets(pos: int, offsets: Tuple[Tuple[int, int], ...]) -> List[int]:
+    """
+    :param pos: starting square
+    :param offsets: format: Tuple[Tuple[file offset, rank offset], ...]
+    :return: all squares on the board reachable with one of the jumps
+    """
+    return [pos + file_offset + 8 * rank_offset for file_offset, rank_offset in offsets
+            if 0 <= pos % 8 + file_offset < 8 and 0 <= pos // 8 + rank_offset < 8]
+
+
+def _ray(pos: int, file_step: int, rank_step: int) -> List[int]:
+    """
+    :return: all squares from pos (exclusive) to the edge of the board in the given direction, nearest first
+    """
+    squares = []
+    file, rank = pos % 8 + file_step, pos // 8 + rank_step
+    while 0 <= file < 8 and 0 <= rank < 8:
+        squares.append(rank * 8 + file)
+        file, rank = file + file_step, rank + rank_step
+    return squares
+
+
+"""
+attack and ray tables shared by all pieces and boards
+"""
+
+ORTHOGONAL_DIRECTIONS: Tuple[int, ...] = (1, -1, 8, -8)
+DIAGONAL_DIRECTIONS: Tuple[int, ...] = (9, -9, 7, -7)
+# format: Dict[square index difference of direction, List[per square List[squares in direction, nearest first]]]
+RAYS: Dict[int, List[List[int]]] = {
+    diff: [_ray(pos, file_step, rank_step) for pos in range(64)]
+    for diff, (file_step, rank_step) in {1: (1, 0), -1: (-1, 0), 8: (0, 1), -8: (0, -1), 9: (1, 1), -9: (-1, -1),
+                                         7: (-1, 1), -7: (1, -1)}.items()
+}
+KNIGHT_TARGETS: List[List[int]] = [_jump_targets(pos, ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1),
+                                                       (-1, 2))) for pos in range(64)]
+KING_TARGETS: List[List[int]] = [_jump_targets(pos, ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1),
+                                                     (1, -1))) for pos in range(64)]
+# squares attacked by a pawn of the given color; format: Dict[white pawn, List[per square List[squares]]]
+PAWN_ATTACKS: Dict[bool, List[List[int]]] = {True: [_jump_targets(pos, ((-1, 1), (1, 1))) for pos in range(64)],
+                                             False: [_jump_targets(pos, ((-1, -1), (1, -1))) for pos in range(64)]}
+
+
 class Piece(ABC):
-    _POS_DIFFS: List[int] = [1, -1, 8, -8, 9, 7, -7, -9]
-    _MAX_MOVES: Dict[int, Dict[int, int]]
+    _POS_DIFFS: Tuple[int, ...] = ORTHOGONAL_DIRECTIONS + DIAGONAL_DIRECTIONS
 
     def __init__(self, pos: int, white_piece: bool, board: Board, symbol: str, fen_symbol: str) -> None:
         self._pos: int = pos
@@ -22,26 +64,8 @@ class Piece(ABC):
         self._symbol: str = symbol
         self._fen_symbol: str = fen_symbol
         self._capture_info: Union[None, Tuple[int, bool]] = None
-        self._MAX_MOVES = self._get_max_moves()
         self._board: Board = board
 
-    def _get_max_moves(self) -> Dict[int, Dict[int, int]]:
-        """
-        :return: Dict[position, Dict[direction, max moves in direction]]
-        """
-        return {
-            i: {
-                j: k for j, k in zip(
-                    (1, -1, 8, -8, 9, -9, 7, -7),
-                    self._get_max_moves_on_position(i))
-                } for i in range(64)
-        }
-
-    @staticmethod
-    def _get_max_moves_on_position(pos) -> List[int]:
-        return [7 - (pos % 8), pos % 8, 7 - ( pos // 8), pos // 8, min(7 - (pos // 8), 7 - (pos % 8)),
-                min(pos // 8, pos % 8), min(7 - (pos // 8), pos % 8), min(pos // 8,7 - (pos % 8))]
-
     def __repr__(self) -> str:
         return f'{"w" if self._white_piece else "b"} {self._fen_symbol} {self._pos}'
 
@@ -144,6 +168,13 @@ class Piece(ABC):
     def pseudo_legal_moves(self) -> Set[MOVE]:
         return self._get_sliding_moves()
 
+    @property
+    def pseudo_legal_captures(self) -> Set[MOVE]:
+        """
+        only captures and promotions; quiet moves are not generated
+        """
+        return self._get_sliding_captures()
+
     @property
     def attacking_squares(self) -> Set[int]:
         """
@@ -157,28 +188,46 @@ class Piece(ABC):
             self._add_direction_moves(moves, diff)
         return moves
 
+    def _get_sliding_captures(self) -> Set[MOVE]:
+        moves = set()
+        for diff in self._POS_DIFFS:
+            for new_pos in RAYS[diff][self._pos]:
+                if self._board.is_square_empty(new_pos):
+                    continue
+                if self._board.opponent_piece_on_square(new_pos, self._white_piece):
+                    self._add_move(moves, new_pos)
+                break
+        return moves
+
     def _add_direction_moves(self, moves_set: Set[MOVE], diff: int) -> None:
-        for new_pos in self._possible_new_positions(diff):
+        for new_pos in RAYS[diff][self._pos]:
             if self._board.own_piece_on_square(new_pos, self._white_piece):
                 return
             self._add_move(moves_set, new_pos)
             if self._board.opponent_piece_on_square(new_pos, self._white_piece):
                 return
 
-    def _possible_new_positions(self, diff: int, limit: Optional[int] = 7) -> Iterator[int]:
+    def _add_jump_moves(self, moves_set: Set[MOVE], targets: List[int]) -> None:
         """
-        generates all possible new positions for a direction
-        :param diff: square index difference of direction
-        :param limit: maximum moves in direction
+        add moves to all given squares not occupied by an own piece
+        :param targets: squares reachable with one jump
         """
-        return range(self._pos + diff, self._pos + ((min(self._MAX_MOVES[self._pos][diff], limit) + 1) * diff), diff)
+        for new_pos in targets:
+            if not self._board.own_piece_on_square(new_pos, self._white_piece):
+                self._add_move(moves_set, new_pos)
+
+    def _add_jump_captures(self, moves_set: Set[MOVE], targets: List[int]) -> None:
+        """
+        add moves to all given squares occupied by an opponent's piece
+        :param targets: squares reachable with one jump
+        """
+        for new_pos in targets:
+            if self._board.opponent_piece_on_square(new_pos, self._white_piece):
+                self._add_move(moves_set, new_pos)
 
     def _add_move(self, moves_set: Set[MOVE], new_pos: int, promotion_type: Optional[str] = None) -> None:
         moves_set.add((self._pos, new_pos, promotion_type))
 
-    def _moves_in_direction_available(self, diff: int) -> bool:
-        return self._MAX_MOVES[self._pos][diff] > 0
-
 
 class Pawn(Piece):
     _BASE_VAL: int = 100
@@ -198,32 +247,13 @@ class Pawn(Piece):
                                                      5, -5,-10,  0,  0,-10, -5,  5,
                                                      5, 10, 10,-20,-20, 10, 10,  5,
                                                      0,  0,  0,  0,  0,  0,  0,  0)}
-    _POS_DIFFS: List[int]
-    _MAX_MOVES: Dict[int, Dict[int, int]]
+    _ADVANCE_DIFFS: Dict[bool, int] = {True: 8, False: -8}
 
     def __init__(self, pos: int, white_piece: bool, board: Board) -> None:
         symbol, fen_symbol = ('♟', 'P') if white_piece else ('♙', 'p')
         super().__init__(pos, white_piece, board, symbol, fen_symbol)
-        self._POS_DIFFS = self._get_pos_diffs()
-        self._MAX_MOVES = self._get_max_moves()
         self._promotion_data: Union[None, Tuple[int, bool]] = None
 
-    def _get_pos_diffs(self):
-        return [8, 9, 7] if self._white_piece else [-8, -9, -7]
-
-    def _get_max_moves(self):
-        return {
-            i: {
-                j: k for j, k in zip(
-                    self._POS_DIFFS,
-                    self._get_max_moves_on_pos(i))
-                } for i in range(64)
-        }
-
-    def _get_max_moves_on_pos(self, pos) -> List[int]:
-        return [7 - (pos // 8), min(7 - (pos // 8), 7 - (pos % 8)), min(7 - (pos // 8), pos % 8)] if self._white_piece \
-            else [pos // 8, min(pos // 8, pos % 8), min(pos // 8, 7 - (pos % 8))]
-
     """
     attribute getters
     """
@@ -269,6 +299,10 @@ class Pawn(Piece):
     def pseudo_legal_moves(self) -> Set[MOVE]:
         return self._get_advances() | self._get_diagonal_capturing_moves() | self._get_en_passant_move()
 
+    @property
+    def pseudo_legal_captures(self) -> Set[MOVE]:
+        return self._get_promotion_advances() | self._get_diagonal_capturing_moves() | self._get_en_passant_move()
+
     @property
     def attacking_squares(self) -> Set[int]:
         return {move[1] for move in self._get_diagonal_capturing_moves()}
@@ -276,40 +310,37 @@ class Pawn(Piece):
     def _get_advances(self) -> Set[MOVE]:
         moves = set()
         move_limit = self._get_move_limit()
-        diff = self._POS_DIFFS[0]
+        diff = self._ADVANCE_DIFFS[self._white_piece]
         self._add_advance_moves(moves, diff, move_limit)
         return moves
 
+    def _get_promotion_advances(self) -> Set[MOVE]:
+        moves = set()
+        new_pos = self._pos + self._ADVANCE_DIFFS[self._white_piece]
+        if self._is_promotion_move(new_pos) and self._board.is_square_empty(new_pos):
+            self._add_move(moves, new_pos)
+        return moves
+
     def _get_diagonal_capturing_moves(self) -> Set[MOVE]:
         moves = set()
-        for diff in self._POS_DIFFS[1:]:
-            self._add_diagonal_capture_move(moves, diff)
+        for new_pos in PAWN_ATTACKS[self._white_piece][self._pos]:
+            if self._board.opponent_piece_on_square(new_pos, self._white_piece):
+                self._add_move(moves, new_pos)
         return moves
 
     def _get_en_passant_move(self) -> Set[MOVE]:
         move = set()
-        for diff in self._POS_DIFFS[1:]:
-            self._add_en_passant_move(move, diff)
+        for new_pos in PAWN_ATTACKS[self._white_piece][self._pos]:
+            if self._is_en_passant_move(new_pos):
+                self._add_move(move, new_pos)
         return move
 
     def _add_advance_moves(self, moves_set: Set[MOVE], diff: int, move_limit: int) -> None:
-        for new_pos in self._possible_new_positions(diff, move_limit):
+        for new_pos in RAYS[diff][self._pos][:move_limit]:
             if not self._board.is_square_empty(new_pos):
                 return
             self._add_move(moves_set, new_pos)
 
-    def _add_diagonal_capture_move(self, moves_set: Set[MOVE], diff) -> None:
-        new_pos = self._pos + diff
-        if not self._moves_in_direction_available(diff):
-            return
-        if self._board.opponent_piece_on_square(new_pos, self._white_piece):
-            self._add_move(moves_set, new_pos)
-
-    def _add_en_passant_move(self, moves_set, diff) -> None:
-        new_pos = self._pos + diff
-        if self._moves_in_direction_available(diff) and self._is_en_passant_move(new_pos):
-            self._add_move(moves_set, new_pos)
-
     def _add_move(self, moves_set: Set[MOVE], new_pos: int, promotion_type: Optional[str] = None) -> None:
         if self._is_promotion_move(new_pos):
             self._add_promotion_moves(moves_set, new_pos)
@@ -355,9 +386,6 @@ class Knight(Piece):
                                                     -30,  5, 10, 15, 15, 10,  5,-30,
                                                     -40,-20,  0,  5,  5,  0,-20,-40,
                                                     -50,-40,-30,-30,-30,-30,-40,-50)}
-    _POS_DIFFS: List[int] = [17, 10, -6, -15, -17, -10, 6, 15]
-    _JUMP_OFFSETS: Dict[int, Tuple[int, int]] = {17: (1, 2), 10: (2, 1), -6: (2, -1), -15: (1, -2), -17: (-1, -2),
-                                                 -10: (-2, -1), 6: (-2, 1), 15: (-1, 2)}
 
     def __init__(self, pos: int, white_piece: bool, board: Board) -> None:
         symbol, fen_symbol = ('♞', 'N') if white_piece else ('♘', 'n')
@@ -370,21 +398,14 @@ class Knight(Piece):
     @property
     def pseudo_legal_moves(self) -> Set[MOVE]:
         moves = set()
-        for diff in self._POS_DIFFS:
-            self._add_direction_moves(moves, diff)
+        self._add_jump_moves(moves, KNIGHT_TARGETS[self._pos])
         return moves
 
-    def _add_direction_moves(self, moves_set: Set[MOVE], diff: int) -> None:
-        if self._moves_in_direction_available(diff):
-            return
-        new_pos = self._pos + diff
-        if not self._board.own_piece_on_square(new_pos, self._white_piece):
-            self._add_move(moves_set, new_pos)
-
-    def _moves_in_direction_available(self, diff: int) -> bool:
-        offset = self._JUMP_OFFSETS[diff]
-        return self.file + offset[0] > 7 or self.file + offset[0] < 0 or self.rank + offset[1] > 7 or \
-               self.rank + offset[1] < 0
+    @property
+    def pseudo_legal_captures(self) -> Set[MOVE]:
+        moves = set()
+        self._add_jump_captures(moves, KNIGHT_TARGETS[self._pos])
+        return moves
 
 
 class Bishop(Piece):
@@ -405,7 +426,7 @@ class Bishop(Piece):
                                                     -10, 10, 10, 10, 10, 10, 10,-10,
                                                     -10,  5,  0,  0,  0,  0,  5,-10,
                                                     -20,-10,-10,-10,-10,-10,-10,-20)}
-    _POS_DIFFS: List[int] = [9, -9, 7, -7]
+    _POS_DIFFS: Tuple[int, ...] = DIAGONAL_DIRECTIONS
 
     def __init__(self, pos: int, white_piece: bool, board: Board) -> None:
         symbol, fen_symbol = ('♝', 'B') if white_piece else ('♗', 'b')
@@ -430,7 +451,7 @@ class Rook(Piece):
                                                     -5,  0,  0,  0,  0,  0,  0, -5,
                                                     -5,  0,  0,  0,  0,  0,  0, -5,
                                                      0,  0,  0,  5,  5,  0,  0,  0)}
-    _POS_DIFFS: List[int] = [1, -1, 8, -8]
+    _POS_DIFFS: Tuple[int, ...] = ORTHOGONAL_DIRECTIONS
 
     def __init__(self, pos: int, white_piece: bool, board: Board) -> None:
         symbol, fen_symbol = ('♜', 'R') if white_piece else ('♖', 'r')
@@ -492,14 +513,19 @@ class King(Piece):
     def pseudo_legal_moves(self) -> Set[MOVE]:
         return self._get_one_square_sliding_moves() | self._get_castling_moves()
 
+    @property
+    def pseudo_legal_captures(self) -> Set[MOVE]:
+        moves = set()
+        self._add_jump_captures(moves, KING_TARGETS[self._pos])
+        return moves
+
     @property
     def attacking_squares(self) -> Set[int]:
         return {move[1] for move in self._get_one_square_sliding_moves()}
 
     def _get_one_square_sliding_moves(self) -> Set[MOVE]:
         moves = set()
-        for diff in self._POS_DIFFS:
-            self._add_direction_moves(moves, diff)
+        self._add_jump_moves(moves, KING_TARGETS[self._pos])
         return moves
 
     def _get_castling_moves(self) -> Set[MOVE]:
@@ -509,13 +535,6 @@ class King(Piece):
                 self._add_move(moves, self._pos + (2 * pos_mod), None)
         return moves
 
-    def _add_direction_moves(self, moves_set: Set[MOVE], diff: int) -> None:
-        if not self._moves_in_direction_available(diff):
-            return
-        new_pos = self._pos + diff
-        if not self._board.own_piece_on_square(new_pos, self._white_piece):
-            self._add_move(moves_set, new_pos)
-
     def _castling_move_available(self, pos_mod: int, n_move: int) -> bool:
         if not self._castling_rights_given(n_move):
             return False
@@ -538,3 +557,20 @@ class King(Piece):
         return self._board.is_king_attacked(self._white_piece) or \
                 self._board.is_square_attacked(self._pos + pos_mod, self._white_piece)
 
+
+
+"""
+evaluation tables shared by all boards and the search
+"""
+
+# value of a piece on a square including its piece-square modifier from white's point of view, i.e. negative for black
+# pieces; format: Dict[fen symbol, List[score per square]]
+PIECE_SQUARE_SCORES: Dict[str, List[int]] = {
+    fen_symbol: [(piece_class._BASE_VAL + piece_class._POS_VAL_MOD[white_piece][pos]) * (1 if white_piece else -1)
+                 for pos in range(64)]
+    for piece_class, symbol in ((Pawn, 'p'), (Knight, 'n'), (Bishop, 'b'), (Rook, 'r'), (Queen, 'q'), (King, 'k'))
+    for white_piece, fen_symbol in ((True, symbol.upper()), (False, symbol))
+}
+# material value of every piece type; format: Dict[lower case fen symbol, value]
+PIECE_VALUES: Dict[str, int] = {'p': Pawn._BASE_VAL, 'n': Knight._BASE_VAL, 'b': Bishop._BASE_VAL, 'r': Rook._BASE_VAL,
+                                'q': Queen._BASE_VAL, 'k': King._BASE_VAL}
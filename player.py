@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import random as r
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING, Union
+
+import packed_move
+from search import ITERATION_INFO, Search
+from transposition import TranspositionTable
 
 if TYPE_CHECKING:
     from chess import MOVE, Board
@@ -74,12 +78,13 @@ class Player(ABC):
         """
         return (ord(pos[0]) - 97) + ((int(pos[1]) - 1) * 8)
 
-    def _move_to_str(self, move: MOVE):
+    def _move_to_str(self, move: Union[MOVE, int]):
         """
         convert ints move to str
-        :param move: move to convert
+        :param move: move to convert; either a move tuple or a packed move
         :return: starting pos and final pos as str
         """
+        move = packed_move.to_tuple(move)
         s = self._pos_to_str(move[0]) + self._pos_to_str(move[1])
         if move[2] is not None:
             s += move[2]
@@ -131,23 +136,48 @@ class HumanPlayer(Player):
         raise ValueError
 
     @staticmethod
-    def _verify_move(move: MOVE, board: Board) -> None:
+    def _verify_move(move: Union[MOVE, int], board: Board) -> None:
         """
         verify that the move is legal
-        :param move: move
+        :param move: move; either a move tuple or a packed move
         :param board: board object
         :raises ValueError if move is not legal
         """
-        if move not in board.legal_moves:
+        if packed_move.to_tuple(move) not in board.legal_moves:
             raise ValueError
 
 
 class ComPlayer(Player):
-    def __init__(self, color: bool) -> None:
+    RANDOM: str = 'random'
+    SEARCH: str = 'search'
+
+    def __init__(self, color: bool, mode: str = RANDOM, search_depth: int = 4, max_nodes: Optional[int] = None,
+                 hash_size_mb: float = 16) -> None:
+        """
+        :param color: whether the player is white
+        :param mode: ComPlayer.RANDOM to play random moves or ComPlayer.SEARCH to play the best move found by a search
+        :param search_depth: maximum search depth in plies; only used in search mode
+        :param max_nodes: node budget per move; only used in search mode; unlimited if None
+        :param hash_size_mb: memory cap of the transposition table kept between moves; only used in search mode
+        """
         super().__init__(color, 'White Com' if color else 'Black Com')
+        if mode not in (self.RANDOM, self.SEARCH):
+            raise ValueError(f'Unknown mode: {mode}')
+        self._mode: str = mode
+        self._search_depth: int = search_depth
+        self._max_nodes: Optional[int] = max_nodes
+        self._tt: Union[None, TranspositionTable] = TranspositionTable(hash_size_mb) if mode == self.SEARCH else None
+
+    @property
+    def mode(self) -> str:
+        """
+        get the move selection mode
+        :return: ComPlayer.RANDOM or ComPlayer.SEARCH
+        """
+        return self._mode
 
     def get_move(self, board: Board) -> MOVE:
-        move = self._get_random_move(board)
+        move = self._get_search_move(board) if self._mode == self.SEARCH else self._get_random_move(board)
         print(f'> {self.name} selected the move: {self._move_to_str(move)}\n')
         return move
 
@@ -158,4 +188,22 @@ class ComPlayer(Player):
         :param board: board object
         :return: random move
         """
-        return r.sample(board.legal_moves, 1)[0]
+        return r.choice(tuple(board.legal_moves))
+
+    def _get_search_move(self, board: Board) -> MOVE:
+        """
+        let the com player select the best move found by an alpha-beta search
+        :param board: board object
+        :return: best move
+        """
+        move, _ = Search(board, self._search_depth, self._max_nodes, self._print_iteration_info, self._tt).search()
+        return move
+
+    def _print_iteration_info(self, info: ITERATION_INFO) -> None:
+        """
+        print the result of a search iteration
+        :param info: format: Tuple[depth, score, nodes, nodes per second, principal variation]
+        """
+        depth, score, nodes, nps, pv = info
+        print(f'> {self.name} depth {depth} score {score} nodes {nodes} nps {nps} pv',
+              ' '.join(self._move_to_str(move) for move in pv))
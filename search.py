@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, List, Optional, Tuple, TYPE_CHECKING, Union
+
+from pieces import PIECE_VALUES
+from transposition import EXACT, LOWER, UPPER
+
+if TYPE_CHECKING:
+    from board import Board
+    from chess import MOVE
+    from transposition import TranspositionTable
+
+"""
+negamax search with alpha-beta pruning and iterative deepening
+scores are given from the point of view of the color to move in centipawns; checkmates are scored as
++-(MATE_SCORE - plies to mate) so that shorter mates are preferred
+"""
+
+MATE_SCORE: int = 1_000_000
+_MATE_BOUND: int = MATE_SCORE - 1_000  # scores beyond are mate scores
+# captures that cannot raise the score above alpha even with this margin are skipped in the quiescence search
+DELTA_MARGIN: int = 200
+
+# format: Tuple[depth, score, nodes, nodes per second, principal variation]
+ITERATION_INFO = Tuple[int, int, int, int, List['MOVE']]
+
+
+class SearchAborted(Exception):
+    """
+    raised inside the search when the node budget is exhausted
+    """
+
+
+class Search:
+    def __init__(self, board: Board, max_depth: int = 4, max_nodes: Optional[int] = None,
+                 on_iteration: Optional[Callable[[ITERATION_INFO], None]] = None,
+                 tt: Optional[TranspositionTable] = None, quiescence: bool = True) -> None:
+        """
+        :param board: board to search; any object with the move and evaluation interface of board.Board
+        :param max_depth: depth of the last iteration in plies
+        :param max_nodes: number of nodes after which the search is aborted; unlimited if None
+        :param on_iteration: called with the info of every completed iteration
+        :param tt: transposition table to probe and fill; positions are keyed by the board's zobrist key
+        :param quiescence: whether the leaves are resolved with a quiescence search over captures and promotions
+        """
+        self._board: Board = board
+        self._tt: Optional[TranspositionTable] = tt
+        self._max_depth: int = max_depth
+        self._max_nodes: Optional[int] = max_nodes
+        self._quiescence: bool = quiescence
+        self._on_iteration: Optional[Callable[[ITERATION_INFO], None]] = on_iteration
+        self._nodes: int = 0
+        self._pv_table: List[List[MOVE]] = []  # principal variation found at every ply
+        self._iterations: List[ITERATION_INFO] = []
+
+    """
+    attribute getters
+    """
+
+    @property
+    def nodes(self) -> int:
+        """
+        :return: number of nodes searched so far
+        """
+        return self._nodes
+
+    @property
+    def iterations(self) -> List[ITERATION_INFO]:
+        """
+        :return: info of all completed iterations
+        """
+        return self._iterations
+
+    @property
+    def principal_variation(self) -> List[MOVE]:
+        """
+        :return: principal variation of the last completed iteration
+        """
+        return self._iterations[-1][4] if self._iterations else []
+
+    """
+    search
+    """
+
+    def search(self) -> Tuple[Union[None, MOVE], int]:
+        """
+        search with increasing depth until the maximum depth is reached or the node budget is exhausted
+        :return: best move and score of the last completed iteration; no move if the position has no legal moves
+        """
+        self._nodes = 0
+        self._iterations = []
+        start = time.perf_counter()
+        best_move: Union[None, MOVE] = None
+        score = 0
+        for depth in range(1, self._max_depth + 1):
+            try:
+                iteration_score = self._search_root(depth)
+            except SearchAborted:
+                break
+            elapsed = time.perf_counter() - start
+            pv = list(self._pv_table[0])
+            self._iterations.append((depth, iteration_score, self._nodes, int(self._nodes / max(elapsed, 1e-9)), pv))
+            if self._on_iteration is not None:
+                self._on_iteration(self._iterations[-1])
+            if not pv:  # no legal moves
+                return None, iteration_score
+            best_move, score = pv[0], iteration_score
+            if abs(score) >= MATE_SCORE - depth:  # mate found; deeper iterations cannot improve it
+                break
+        if best_move is None and self._board.legal_moves:  # budget exhausted in the first iteration
+            best_move = next(iter(self._board.legal_moves))
+        return best_move, score
+
+    def _search_root(self, depth: int) -> int:
+        """
+        search the root position to the given depth
+        :param depth: depth in plies
+        :return: score of the root position
+        """
+        self._pv_table = [[] for _ in range(depth + 1)]
+        return self._negamax(depth, 0, -MATE_SCORE - 1, MATE_SCORE + 1)
+
+    def _negamax(self, depth: int, ply: int, alpha: int, beta: int) -> int:
+        """
+        alpha-beta search in negamax form
+        :param depth: remaining depth in plies
+        :param ply: distance to the root
+        :param alpha: lower bound of the score
+        :param beta: upper bound of the score
+        :return: score of the position for the color to move
+        :raises SearchAborted if the node budget is exhausted
+        """
+        board = self._board
+        self._pv_table[ply] = []
+        if depth == 0 and self._quiescence:
+            if board.seventy_five_move_rule_applies or board.fivefold_repetition_rule_applies or \
+                    board.is_dead_position:
+                return 0
+            return self._quiescence_search(ply, alpha, beta)
+        self._count_node()
+        moves = board.legal_moves
+        if not moves:
+            return -MATE_SCORE + ply if board.is_king_attacked(board.white_to_move) else 0
+        if ply > 0 and (board.seventy_five_move_rule_applies or board.fivefold_repetition_rule_applies or
+                        board.is_dead_position):
+            return 0
+        if depth == 0:
+            return board.static_eval
+        tt_move: Union[None, MOVE] = None
+        if self._tt is not None:
+            entry = self._tt.probe(board.zobrist_key)
+            if entry is not None:
+                tt_move = entry[4]
+                if ply > 0 and entry[1] >= depth:
+                    score = _score_from_tt(entry[3], ply)
+                    if entry[2] == EXACT or (entry[2] == LOWER and score >= beta) or \
+                            (entry[2] == UPPER and score <= alpha):
+                        if tt_move is not None:
+                            self._pv_table[ply] = [tt_move]
+                        return score
+        original_alpha = alpha
+        best_score = -MATE_SCORE - 1
+        best_move: Union[None, MOVE] = None
+        for move in self._ordered_moves(moves, ply, tt_move):
+            with board.make_move_and_undo_move_afterwards(move):
+                score = -self._negamax(depth - 1, ply + 1, -beta, -alpha)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    self._pv_table[ply] = [move] + self._pv_table[ply + 1]
+                    if score >= beta:
+                        break
+        if self._tt is not None:
+            bound = UPPER if best_score <= original_alpha else LOWER if best_score >= beta else EXACT
+            self._tt.store(board.zobrist_key, depth, bound, _score_to_tt(best_score, ply), best_move)
+        return best_score
+
+    def _quiescence_search(self, ply: int, alpha: int, beta: int) -> int:
+        """
+        search captures and promotions until the position is quiet to avoid the horizon effect
+        the static evaluation is a lower bound of the score (stand pat) unless the king is in check; then all evasions
+        are searched
+        :param ply: distance to the root
+        :param alpha: lower bound of the score
+        :param beta: upper bound of the score
+        :return: score of the position for the color to move
+        :raises SearchAborted if the node budget is exhausted
+        """
+        self._count_node()
+        board = self._board
+        in_check = board.is_king_attacked(board.white_to_move)
+        if in_check:
+            moves = board.legal_moves
+            if not moves:
+                return -MATE_SCORE + ply
+            best_score = -MATE_SCORE - 1
+        else:
+            best_score = stand_pat = board.static_eval
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+            moves = board.legal_captures
+        for move, gain in self._ordered_captures(moves):
+            if not in_check and stand_pat + gain + DELTA_MARGIN <= alpha:  # delta pruning
+                continue
+            with board.make_move_and_undo_move_afterwards(move):
+                score = -self._quiescence_search(ply + 1, -beta, -alpha)
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if score >= beta:
+                        break
+        return best_score
+
+    def _ordered_captures(self, moves: Union[List[MOVE], set]) -> List[Tuple[MOVE, int]]:
+        """
+        order the moves by the value of the captured piece, then by the value of the capturing piece
+        :param moves: legal moves
+        :return: format: List[Tuple[move, material gain of the move if not recaptured]]
+        """
+        board = self._board
+        captures = []
+        for move in moves:
+            victim = board.piece_on_square(move[1])
+            gain = 0 if victim is None else PIECE_VALUES[victim.lower()]
+            attacker = board.piece_on_square(move[0]).lower()
+            if victim is None and attacker == 'p' and move[1] == board.ep_target_square:
+                gain = PIECE_VALUES['p']
+            if move[2] is not None:
+                gain += PIECE_VALUES[move[2].lower()] - PIECE_VALUES['p']
+            captures.append((-gain, PIECE_VALUES[attacker], move[0], move[1], move[2] or '', move))
+        captures.sort()
+        return [(capture[5], -capture[0]) for capture in captures]
+
+    def _count_node(self) -> None:
+        """
+        count a searched node
+        :raises SearchAborted if the node budget is exhausted
+        """
+        self._nodes += 1
+        if self._max_nodes is not None and self._nodes > self._max_nodes:
+            raise SearchAborted
+
+    def _ordered_moves(self, moves: Union[List[MOVE], set], ply: int, tt_move: Union[None, MOVE] = None) \
+            -> List[MOVE]:
+        """
+        order the moves so that the move of the transposition table or else of the last principal variation is
+        searched first
+        :param moves: legal moves
+        :param ply: distance to the root
+        :param tt_move: best move stored in the transposition table
+        :return: ordered moves
+        """
+        moves = sorted(moves, key=lambda move: (move[0], move[1], move[2] or ''))  # deterministic order
+        pv = self._iterations[-1][4] if self._iterations else []
+        first_move = tt_move if tt_move is not None else pv[ply] if ply < len(pv) else None
+        if first_move in moves:
+            moves.remove(first_move)
+            moves.insert(0, first_move)
+        return moves
+
+
+def _score_to_tt(score: int, ply: int) -> int:
+    """
+    convert a mate score relative to the root into a score relative to the stored position
+    :param score: score relative to the root
+    :param ply: distance of the position to the root
+    :return: score to store
+    """
+    if score > _MATE_BOUND:
+        return score + ply
+    if score < -_MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score: int, ply: int) -> int:
+    """
+    convert a stored mate score into a score relative to the root
+    :param score: stored score
+    :param ply: distance of the position to the root
+    :return: score relative to the root
+    """
+    if score > _MATE_BOUND:
+        return score - ply
+    if score < -_MATE_BOUND:
+        return score + ply
+    return score
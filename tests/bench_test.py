@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from bench import BENCHMARK_POSITIONS, compare, load_baseline, load_epd, run_benchmark, save_baseline
+
+
+class LoadEpdTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'positions.epd')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _write(self, text: str) -> None:
+        with open(self.path, 'w') as file:
+            file.write(text)
+
+    def test_reads_fen_and_node_counts(self):
+        self._write('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - ;D1 14 ;D2 191\n')
+        (_, fen, depth, known), = load_epd(self.path)
+        self.assertEqual('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', fen)
+        self.assertEqual(2, depth)
+        self.assertEqual([14, 191], known)
+
+    def test_keeps_move_counters_of_full_fens(self):
+        self._write('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8 ;D1 44\n')
+        self.assertEqual('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', load_epd(self.path)[0][1])
+
+    def test_uses_default_depth_without_node_counts(self):
+        self._write('k7/8/8/8/8/8/8/K7 w - -\n')
+        self.assertEqual(3, load_epd(self.path, 3)[0][2])
+
+    def test_skips_empty_lines_and_comments(self):
+        self._write('# comment\n\nk7/8/8/8/8/8/8/K7 w - - ;D1 3\n')
+        self.assertEqual(1, len(load_epd(self.path)))
+
+
+class RunBenchmarkTestCase(unittest.TestCase):
+    def test_counts_nodes_and_checks_known_counts(self):
+        result, = run_benchmark(BENCHMARK_POSITIONS[:1], depth=2, repeat=2)
+        self.assertEqual(400, result['nodes'])
+        self.assertEqual(400, result['expected_nodes'])
+        self.assertEqual(2, len(result['times']))
+        self.assertGreater(result['nps'], 0)
+
+    def test_bitboard_counts_same_nodes(self):
+        self.assertEqual(run_benchmark(BENCHMARK_POSITIONS[2:3], repeat=1)[0]['nodes'],
+                         run_benchmark(BENCHMARK_POSITIONS[2:3], repeat=1, board_type='bitboard')[0]['nodes'])
+
+    def test_expected_nodes_unknown_beyond_known_counts(self):
+        position = ('kings', 'k7/8/8/8/8/8/8/K7 w - - 0 1', 2, [3])
+        self.assertIsNone(run_benchmark([position], repeat=1)[0]['expected_nodes'])
+
+
+class BaselineTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.baseline = [{'name': 'a', 'fen': 'fen a', 'depth': 3, 'nps': 100_000},
+                         {'name': 'b', 'fen': 'fen b', 'depth': 2, 'nps': 200_000}]
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_baseline(self.baseline, path)
+            self.assertEqual(self.baseline, load_baseline(path))
+
+    def test_flags_slowdown_above_threshold(self):
+        results = [{'name': 'a', 'fen': 'fen a', 'depth': 3, 'nps': 90_000},
+                   {'name': 'b', 'fen': 'fen b', 'depth': 2, 'nps': 198_000}]
+        regressions = compare(results, self.baseline, 5)
+        self.assertEqual(1, len(regressions))
+        self.assertTrue(regressions[0].startswith('a (depth 3)'))
+
+    def test_ignores_positions_missing_in_baseline(self):
+        results = [{'name': 'a', 'fen': 'fen a', 'depth': 4, 'nps': 1}]
+        self.assertEqual([], compare(results, self.baseline, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,254 @@
+import unittest
+from typing import List
+
+import packed_move
+from bitboard import BitBoard
+from board import Board
+from tests.board_tests.perft_test import perft_legal_moves
+
+board1 = BitBoard()
+board2 = BitBoard('rnbqkbnr/ppppp1pp/8/8/5pP1/8/PPPPPP1P/RNBQKBNR b Qk g3 0 2')
+
+
+class ConstructionTestCase(unittest.TestCase):
+    def test_pieces_initialize_correctly(self):
+        self.assertEqual(0xFF00, board1._bbs[0])
+        self.assertEqual(0x00FF000000000000, board1._bbs[6])
+        self.assertEqual(1 << 4, board1._bbs[5])
+        self.assertEqual(1 << 60, board1._bbs[11])
+
+    def test_occupancy_initializes_correctly(self):
+        self.assertEqual(0xFFFF, board1._occ[0])
+        self.assertEqual(0xFFFF << 48, board1._occ[1])
+
+    def test_squares_table_matches_piece_masks(self):
+        for pos, index in enumerate(board2._squares):
+            if index is None:
+                self.assertFalse((board2._occ[0] | board2._occ[1]) >> pos & 1)
+            else:
+                self.assertTrue(board2._bbs[index] >> pos & 1)
+
+    def test_board_data_initializes_correctly(self):
+        self.assertFalse(board2.white_to_move)
+        self.assertEqual([False, True, True, False], board2.castling_rights)
+        self.assertEqual(22, board2.ep_target_square)
+        self.assertEqual(0, board2.half_move_clock)
+        self.assertEqual(2, board2.turn_number)
+
+    def test_can_get_fen(self):
+        self.assertEqual('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1', board1.fen)
+
+    def test_can_get_any_fen(self):
+        self.assertEqual('rnbqkbnr/ppppp1pp/8/8/5pP1/8/PPPPPP1P/RNBQKBNR b Qk g3 0 2', board2.fen)
+
+
+class LegalMovesTestCase(unittest.TestCase):
+    def assert_same_moves_as_board(self, fen: str) -> None:
+        self.assertEqual(Board(fen).legal_moves, BitBoard(fen).legal_moves)
+
+    def test_generates_same_moves_as_board(self):
+        self.assert_same_moves_as_board('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
+
+    def test_generates_same_moves_as_board_in_any_position(self):
+        self.assert_same_moves_as_board('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+
+    def test_generates_promotions(self):
+        self.assert_same_moves_as_board('7k/P7/8/8/8/2b5/1r6/K7 w - - 0 1')
+
+    def test_generates_en_passant_capture(self):
+        self.assertIn((29, 22, None), board2.legal_moves)
+
+    def test_en_passant_capture_cannot_discover_attack_on_king(self):
+        board = BitBoard('8/8/8/K1pP3r/8/8/8/7k w - c6 0 1')
+        self.assertNotIn((35, 42, None), board.legal_moves)
+
+    def test_pinned_piece_can_only_move_along_pin_line(self):
+        board = BitBoard('k3r3/8/8/8/8/8/4R3/4K3 w - - 0 1')
+        self.assertNotIn((12, 13, None), board.legal_moves)
+        self.assertIn((12, 20, None), board.legal_moves)
+        self.assertIn((12, 60, None), board.legal_moves)
+
+    def test_only_king_moves_in_double_check(self):
+        board = BitBoard('r6R/1k6/8/8/8/8/1P6/K6r w - - 0 1')
+        self.assertEqual(set(), board.legal_moves)
+
+    def test_cannot_castle_through_attacked_square(self):
+        board = BitBoard('4k3/8/8/8/8/8/5r2/R3K2R w KQ - 0 1')
+        self.assertNotIn((4, 6, None), board.legal_moves)
+        self.assertIn((4, 2, None), board.legal_moves)
+
+    def test_packed_moves_equal_move_tuples(self):
+        board = BitBoard('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 b kq - 0 1')
+        self.assertEqual(board.legal_moves, {packed_move.decode(move) for move in board.packed_legal_moves})
+
+    def test_does_not_recalculate_legal_moves(self):
+        self.assertIs(board1.legal_moves, board1.legal_moves)
+
+
+class MakeMoveTestCase(unittest.TestCase):
+    def test_make_move_updates_fen(self):
+        board = BitBoard()
+        board.make_move((12, 28, None))
+        self.assertEqual('rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1', board.fen)
+
+    def test_castling_moves_rook_and_removes_rights(self):
+        board = BitBoard('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+        board.make_move((4, 6, None))
+        self.assertEqual('r3k2r/8/8/8/8/8/8/R4RK1 b kq - 1 1', board.fen)
+
+    def test_capturing_rook_removes_castling_right(self):
+        board = BitBoard('r3k2r/8/8/8/8/8/6B1/R3K2R w KQkq - 0 1')
+        board.make_move((14, 63, None))
+        self.assertEqual('r3k2B/8/8/8/8/8/8/R3K2R b KQq - 0 1', board.fen)
+
+    def test_en_passant_removes_captured_pawn(self):
+        board = BitBoard('rnbqkbnr/ppppp1pp/8/8/5pP1/8/PPPPPP1P/RNBQKBNR b Qk g3 0 2')
+        board.make_move((29, 22, None))
+        self.assertEqual('rnbqkbnr/ppppp1pp/8/8/8/6p1/PPPPPP1P/RNBQKBNR w Qk - 0 3', board.fen)
+
+    def test_zobrist_key_equals_board_zobrist_key(self):
+        fen = 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1'
+        board = BitBoard(fen)
+        for move in board.legal_moves:
+            with board.make_move_and_undo_move_afterwards(move):
+                reference = Board(fen)
+                reference.make_move(move)
+                self.assertEqual(reference.zobrist_key, board.zobrist_key)
+                self.assertEqual(board._get_zobrist_key(), board.zobrist_key)
+
+    def test_promotion_replaces_pawn(self):
+        board = BitBoard('7k/P7/8/8/8/8/8/K7 w - - 0 1')
+        board.make_move((48, 56, 'N'))
+        self.assertEqual('N6k/8/8/8/8/8/8/K7 b - - 0 1', board.fen)
+
+    def test_packed_promotion_replaces_pawn(self):
+        board = BitBoard('8/8/8/8/8/8/p6k/7K b - - 0 1')
+        board.make_move(packed_move.encode((8, 0, 'r')))
+        self.assertEqual('8/8/8/8/8/8/7k/r6K w - - 0 2', board.fen)
+
+    def test_packed_and_tuple_moves_reach_same_position(self):
+        fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+        board = BitBoard(fen)
+        for move in board.packed_legal_moves:
+            with board.make_move_and_undo_move_afterwards(move):
+                reference = BitBoard(fen)
+                reference.make_move(packed_move.decode(move))
+                self.assertEqual(reference.fen, board.fen)
+                self.assertEqual(reference.zobrist_key, board.zobrist_key)
+            self.assertEqual(fen, board.fen)
+
+    def test_undo_restores_every_position(self):
+        fen = 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1'
+        board = BitBoard(fen)
+        bbs = list(board._bbs)
+        for move in board.legal_moves:
+            with board.make_move_and_undo_move_afterwards(move):
+                for reply in board.legal_moves:
+                    with board.make_move_and_undo_move_afterwards(reply):
+                        pass
+            self.assertEqual(fen, board.fen)
+            self.assertEqual(bbs, board._bbs)
+
+
+class BoardStateTestCase(unittest.TestCase):
+    def test_checkmate(self):
+        self.assertTrue(BitBoard('k7/8/8/8/8/2b5/1q6/K7 w - - 0 1').checkmate)
+        self.assertFalse(BitBoard('k7/8/8/8/8/2b5/1r6/K7 w - - 0 1').checkmate)
+
+    def test_stalemate(self):
+        self.assertTrue(BitBoard('k7/8/8/8/8/2b5/1r6/K7 w - - 0 1').stalemate)
+        self.assertFalse(BitBoard('k7/8/8/8/8/2b5/1q6/K7 w - - 0 1').stalemate)
+
+    def test_seventy_five_move_rule(self):
+        self.assertTrue(BitBoard('8/8/8/8/8/8/8/kp5K w - - 75 1').is_draw)
+
+    def test_fivefold_repetition_rule(self):
+        board = BitBoard()
+        for _ in range(4):
+            for move in ((1, 18, None), (57, 42, None), (18, 1, None), (42, 57, None)):
+                board.make_move(move)
+        self.assertTrue(board.fivefold_repetition_rule_applies)
+
+    def test_dead_positions(self):
+        self.assertTrue(BitBoard('8/8/8/8/8/8/8/k6K w - - 0 1').is_dead_position)
+        self.assertTrue(BitBoard('N7/8/8/8/8/8/8/k6K w - - 0 1').is_dead_position)
+        self.assertTrue(BitBoard('B1b5/8/8/8/8/8/8/k6K w - - 0 1').is_dead_position)
+        self.assertFalse(BitBoard('Bb6/8/8/8/8/8/8/k6K w - - 0 1').is_dead_position)
+        self.assertFalse(BitBoard('1P6/8/8/8/8/8/8/k6K w - - 0 1').is_dead_position)
+
+    def test_piece_on_square_equals_board_piece_on_square(self):
+        fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+        board, bitboard = Board(fen), BitBoard(fen)
+        self.assertEqual([board.piece_on_square(pos) for pos in range(64)],
+                         [bitboard.piece_on_square(pos) for pos in range(64)])
+
+    def test_value_equals_board_value(self):
+        for fen in ('3qk3/8/8/8/8/8/P7/3QK3 w - - 0 1', '3qk2K/8/8/8/8/8/8/3Q4 b - - 0 1',
+                    'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 1'):
+            self.assertEqual(Board(fen).val, BitBoard(fen).val)
+
+    def test_static_eval_equals_board_static_eval_after_every_move(self):
+        fen = 'r3k2r/pP1p2pp/8/2P5/8/8/6PP/R3K2R w KQkq - 0 1'
+        board, bitboard = Board(fen), BitBoard(fen)
+        for move in ((4, 6, None), (51, 35, None), (34, 43, None), (60, 58, None), (49, 56, 'Q'), (59, 56, None)):
+            board.make_move(move)
+            bitboard.make_move(move)
+            self.assertEqual(board.static_eval, bitboard.static_eval)
+            self.assertEqual(bitboard._get_score(), bitboard._score)
+        for _ in range(6):
+            bitboard._undo_move()
+        self.assertEqual(Board(fen).static_eval, bitboard.static_eval)
+
+    def test_value_is_minus_infinity_if_checkmate(self):
+        self.assertEqual(float('-inf'), BitBoard('k7/8/8/8/8/2b5/1q6/K7 w - - 0 1').val)
+
+
+class PerftPositionsTestCase(unittest.TestCase):
+    """
+    same positions as the Board perft tests at higher depths
+    """
+
+    def test_starting_position(self):
+        search_depth: int = 4
+        results: List[int] = [20, 400, 8_902, 197_281, 4_865_609]
+        self.assertEqual(results[search_depth - 1], perft_legal_moves(BitBoard(), search_depth))
+
+    def test_position_2(self):
+        search_depth: int = 3
+        results: List[int] = [48, 2_039, 97_862, 4_085_603]
+        board = BitBoard('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        self.assertEqual(results[search_depth - 1], perft_legal_moves(board, search_depth))
+
+    def test_position_3(self):
+        search_depth: int = 4
+        results: List[int] = [14, 191, 2_812, 43_238, 674_624]
+        board = BitBoard('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1')
+        self.assertEqual(results[search_depth - 1], perft_legal_moves(board, search_depth))
+
+    def test_position_4(self):
+        search_depth: int = 4
+        results: List[int] = [6, 264, 9_467, 422_333]
+        board = BitBoard('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1')
+        self.assertEqual(results[search_depth - 1], perft_legal_moves(board, search_depth))
+
+    def test_position_4_5(self):
+        search_depth: int = 4
+        results: List[int] = [6, 264, 9_467, 422_333]
+        board = BitBoard('r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1')
+        self.assertEqual(results[search_depth - 1], perft_legal_moves(board, search_depth))
+
+    def test_position_5(self):
+        search_depth: int = 3
+        results: List[int] = [44, 1_486, 62_379, 2_103_487]
+        board = BitBoard('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8')
+        self.assertEqual(results[search_depth - 1], perft_legal_moves(board, search_depth))
+
+    def test_position_6(self):
+        search_depth: int = 3
+        results: List[int] = [46, 2_079, 89_890, 3_894_594]
+        board = BitBoard('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10')
+        self.assertEqual(results[search_depth - 1], perft_legal_moves(board, search_depth))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 
+import packed_move
 from board import Board, Pawn, Knight, Bishop, Rook, Queen, King
 
 board1 = Board()
@@ -77,22 +78,35 @@ class ConstructionTestCase(unittest.TestCase):
     def test_moves_log_is_always_empty_list(self):
         self.assertEqual([], board2._moves_log)
 
-    def test_positions_log_is_list_with_all_piece_positions(self):
-        self.assertEqual([{('P', 8), ('P', 9), ('P', 10), ('P', 11), ('P', 12), ('P', 13), ('P', 14), ('P', 15),
-                           ('p', 48), ('p', 49), ('p', 50), ('p', 51), ('p', 52), ('p', 53), ('p', 54), ('p', 55),
-                           ('R', 0), ('N', 1), ('B', 2), ('Q', 3), ('K', 4), ('B', 5), ('N', 6), ('R', 7), ('r', 56),
-                           ('n', 57), ('b', 58), ('q', 59), ('k', 60), ('b', 61), ('n', 62), ('r', 63)}],
-                         board1._positions_log)
+    def test_zobrist_log_is_list_with_key_of_position(self):
+        self.assertEqual([board1._get_zobrist_key()], board1._zobrist_log)
 
-    def test_positions_log_always_is_list_with_all_piece_positions(self):
-        self.assertEqual([{('P', 8), ('P', 9), ('P', 10), ('P', 11), ('P', 12), ('P', 29), ('P', 14), ('P', 15),
-                           ('p', 48), ('p', 49), ('p', 50), ('p', 51), ('p', 52), ('p', 37), ('p', 54), ('p', 55),
-                           ('R', 0), ('N', 1), ('B', 2), ('Q', 3), ('K', 4), ('B', 5), ('N', 6), ('R', 7), ('r', 56),
-                           ('n', 57), ('b', 58), ('q', 59), ('k', 60), ('b', 61), ('n', 62), ('r', 63)}],
-                         board2._positions_log)
+    def test_zobrist_log_always_is_list_with_key_of_position(self):
+        self.assertEqual([board2._get_zobrist_key()], board2._zobrist_log)
+
+    def test_zobrist_key_differs_for_different_positions(self):
+        self.assertNotEqual(board1.zobrist_key, board2.zobrist_key)
+
+    def test_zobrist_key_depends_on_color_to_move(self):
+        self.assertNotEqual(Board('k7/8/8/8/8/8/8/K7 w - - 0 1').zobrist_key,
+                            Board('k7/8/8/8/8/8/8/K7 b - - 0 1').zobrist_key)
+
+    def test_zobrist_key_depends_on_castling_rights(self):
+        self.assertNotEqual(Board('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1').zobrist_key,
+                            Board('r3k2r/8/8/8/8/8/8/R3K2R w KQk - 0 1').zobrist_key)
+
+    def test_zobrist_key_depends_on_ep_target_square(self):
+        self.assertNotEqual(Board('k7/8/8/8/4P3/8/8/K7 b - e3 0 1').zobrist_key,
+                            Board('k7/8/8/8/4P3/8/8/K7 b - - 0 1').zobrist_key)
 
 
 class ChessGameDataGetterTestCase(unittest.TestCase):
+    def test_can_get_fen(self):
+        self.assertEqual('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1', board1.fen)
+
+    def test_can_get_any_fen(self):
+        self.assertEqual('rnbqkbnr/ppppp1pp/8/5p2/5P2/8/PPPPP1PP/RNBQKBNR b - f5 2 2', board2.fen)
+
     def test_can_get_pieces(self):
         self.assertEqual(board1._pieces, board1.pieces)
 
@@ -371,12 +385,30 @@ class PieceTestCase(unittest.TestCase):
     def test_uses_given_piece_set(self):
         self.assertRaises(ValueError, board1._get_piece, 0, set())
 
-    def test_uses_active_pieces_set(self):
+    def test_uses_squares_table(self):
         board = Board()
-        board._get_piece(8).capture(1, True)
-        board._clear_active_pieces_cache()
+        board._remove_piece_from_square(8).capture(1, True)
         self.assertRaises(ValueError, board._get_piece, 8)
 
+    def test_squares_table_matches_active_pieces(self):
+        for piece in board2._active_pieces:
+            self.assertIs(piece, board2._squares[piece.pos])
+        self.assertEqual(len(board2._active_pieces), 64 - board2._squares.count(None))
+
+    def test_can_remove_piece_from_square(self):
+        board = Board()
+        pawn = board._get_piece(8)
+        self.assertIs(pawn, board._remove_piece_from_square(8))
+        self.assertIsNone(board._squares[8])
+
+    def test_can_move_piece_on_squares(self):
+        board = Board()
+        pawn = board._get_piece(8)
+        board._move_piece_on_squares(8, 16)
+        self.assertIsNone(board._squares[8])
+        self.assertIs(pawn, board._squares[16])
+        self.assertEqual(16, pawn.pos)
+
     def test_can_get_white_king(self):
         board = Board('8/8/8/8/8/8/8/K7 w - - 0 1')
         king = board._get_piece(0)
@@ -477,12 +509,18 @@ class PositionsStateTestCase(unittest.TestCase):
     def test_is_square_empty_can_use_given_piece_set(self):
         self.assertTrue(board1.is_square_empty(16, set()))
 
-    def test_is_square_empty_uses_active_pieces_set(self):
+    def test_is_square_empty_uses_squares_table(self):
         board = Board()
-        board._get_piece(8).capture(1, True)
-        board._clear_active_pieces_cache()
+        board._remove_piece_from_square(8).capture(1, True)
         self.assertTrue(board.is_square_empty(8))
 
+    def test_piece_on_square_returns_fen_symbol(self):
+        self.assertEqual('R', board1.piece_on_square(0))
+        self.assertEqual('r', board1.piece_on_square(63))
+
+    def test_piece_on_square_returns_none_if_square_is_empty(self):
+        self.assertIsNone(board1.piece_on_square(16))
+
     def test_own_piece_on_square_if_own_piece_on_square(self):
         self.assertTrue(board1.own_piece_on_square(0, True))
 
@@ -492,10 +530,9 @@ class PositionsStateTestCase(unittest.TestCase):
     def test_not_own_piece_on_square_if_opponents_piece_on_square(self):
         self.assertFalse(board1.own_piece_on_square(63, True))
 
-    def test_own_piece_on_square_uses_active_pieces_set(self):
+    def test_own_piece_on_square_uses_squares_table(self):
         board = Board()
-        board._get_piece(8).capture(1, True)
-        board._clear_active_pieces_cache()
+        board._remove_piece_from_square(8).capture(1, True)
         self.assertFalse(board.own_piece_on_square(8, True))
 
     def test_opponent_piece_on_square_if_opponent_piece_on_square(self):
@@ -507,10 +544,9 @@ class PositionsStateTestCase(unittest.TestCase):
     def test_not_opponent_piece_on_square_if_own_piece_on_square(self):
         self.assertFalse(board1.opponent_piece_on_square(0, True))
 
-    def test_opponent_piece_on_square_uses_active_pieces_set(self):
+    def test_opponent_piece_on_square_uses_squares_table(self):
         board = Board()
-        board._get_piece(8).capture(1, True)
-        board._clear_active_pieces_cache()
+        board._remove_piece_from_square(8).capture(1, True)
         self.assertFalse(board.opponent_piece_on_square(8, False))
 
     def test_square_is_not_attacked_if_not_attacked_by_opponent_piece(self):
@@ -537,9 +573,9 @@ class PositionsStateTestCase(unittest.TestCase):
         board = Board('7Q/8/8/8/8/8/8/K7 w - - 0 1')
         self.assertFalse(board.is_square_attacked(7, True))
 
-    def test_is_square_attacked_uses_active_pieces_set(self):
+    def test_is_square_attacked_uses_squares_table(self):
         board = Board()
-        board._get_piece(8).capture(1, True)
+        board._remove_piece_from_square(8).capture(1, True)
         board._clear_active_pieces_cache()
         self.assertTrue(board.is_square_attacked(48, False))
 
@@ -562,9 +598,9 @@ class PositionsStateTestCase(unittest.TestCase):
         board = Board('k7/8/8/8/8/8/R7/K7 w - - 0 1')
         self.assertTrue(board.is_king_attacked(False))
 
-    def test_is_king_attacked_uses_active_pieces_set(self):
+    def test_is_king_attacked_uses_squares_table(self):
         board = Board('k7/r7/8/8/8/8/8/K7 w - - 0 1')
-        board._get_piece(48).capture(1, True)
+        board._remove_piece_from_square(48).capture(1, True)
         board._clear_active_pieces_cache()
         self.assertFalse(board.is_king_attacked(True))
 
@@ -767,6 +803,33 @@ class LegalMoveGenerationTextCase(unittest.TestCase):
     def test_does_never_recalculate_legal_moves(self):
         self.assertIs(board2._legal_moves, board2._legal_moves)
 
+    def test_square_is_attacked_by_pawn_even_if_empty(self):
+        board = Board('k7/8/8/8/8/8/6p1/4K2R w K - 0 1')
+        self.assertTrue(board.is_square_attacked(5, True))
+
+    def test_pinned_piece_can_only_move_along_pin_line(self):
+        board = Board('k3r3/8/8/8/8/8/4R3/4K3 w - - 0 1')
+        self.assertNotIn((12, 13, None), board._legal_moves)
+        self.assertIn((12, 20, None), board._legal_moves)
+        self.assertIn((12, 60, None), board._legal_moves)
+
+    def test_only_moves_resolving_check_are_legal(self):
+        board = Board('k3r3/8/8/8/7R/8/8/4K3 w - - 0 1')
+        self.assertEqual({(31, 28, None), (4, 3, None), (4, 5, None), (4, 11, None), (4, 13, None)},
+                         board._legal_moves)
+
+    def test_only_king_moves_in_double_check(self):
+        board = Board('r6R/1k6/8/8/8/8/1P6/K6r w - - 0 1')
+        self.assertEqual(set(), board._legal_moves)
+
+    def test_en_passant_capture_can_not_discover_attack_on_king(self):
+        board = Board('8/8/8/K1pP3r/8/8/8/7k w - c6 0 1')
+        self.assertNotIn((35, 42, None), board._legal_moves)
+
+    def test_king_can_not_castle_through_square_attacked_by_pawn(self):
+        board = Board('k7/8/8/8/8/8/6p1/4K2R w K - 0 1')
+        self.assertNotIn((4, 6, None), board._legal_moves)
+
     def test_king_can_not_move_into_check(self):
         board = Board('k7/8/8/8/8/8/7r/K7 w - - 0 1')
         self.assertEqual({(0, 1, None)}, board._legal_moves)
@@ -943,28 +1006,28 @@ class MakeMoveTestCase(unittest.TestCase):
         turn = board.turn_number
         b_rook = board._get_piece(56)
         board.make_move((0, 56, None))
-        self.assertEqual(turn, b_rook._capture_data[0])
+        self.assertEqual(turn, b_rook._capture_info[0])
 
     def test_capture_turn_correct_after_black_captures(self):
         board = Board('r7/8/8/8/8/8/5K1k/R7 b - - 0 1')
         turn = board.turn_number
         w_rook = board._get_piece(0)
         board.make_move((56, 0, None))
-        self.assertEqual(turn, w_rook._capture_data[0])
+        self.assertEqual(turn, w_rook._capture_info[0])
 
     def test_capture_color_correct_after_white_captures(self):
         board = Board('r7/8/8/8/7k/8/7K/R7 w - - 0 1')
         color = board._white_to_move
         b_rook = board._get_piece(56)
         board.make_move((0, 56, None))
-        self.assertEqual(color, b_rook._capture_data[1])
+        self.assertEqual(color, b_rook._capture_info[1])
 
     def test_capture_color_correct_after_black_captures(self):
         board = Board('r7/8/8/8/8/8/5K1k/R7 b - - 0 1')
         color = board._white_to_move
         w_rook = board._get_piece(0)
         board.make_move((56, 0, None))
-        self.assertEqual(color, w_rook._capture_data[1])
+        self.assertEqual(color, w_rook._capture_info[1])
 
     # castling moves
     def test_rook_moved_after_castling_kingside_as_white(self):
@@ -1277,27 +1340,66 @@ class MakeMoveTestCase(unittest.TestCase):
         board.make_move((48, 40, None))
         self.assertEqual([(8, 16, None), (48, 40, None)], board._moves_log)
 
-    def test_adds_positions_to_positions_log(self):
-        board = Board('k7/8/8/8/8/8/P7/K7 w - - 0 1')
+    def test_makes_packed_moves(self):
+        board = Board('7k/P7/8/8/8/8/8/K7 w - - 0 1')
+        board.make_move(packed_move.encode((48, 56, 'Q')))
+        self.assertEqual('Q6k/8/8/8/8/8/8/K7 b - - 0 1', board.fen)
+
+    def test_adds_empty_undo_record_to_undo_log(self):
+        board = Board()
         board.make_move((8, 16, None))
-        self.assertEqual([{('K', 0), ('P', 8), ('k', 56)}, {('K', 0), ('P', 16), ('k', 56)}], board._positions_log)
+        self.assertEqual([(None, None, None)], board._undo_log)
 
-    def test_adds_any_positions_to_positions_log(self):
-        board = Board('k7/8/8/8/8/8/P7/K7 w - - 0 1')
-        board.make_move((0, 1, None))
-        self.assertEqual([{('K', 0), ('P', 8), ('k', 56)}, {('K', 1), ('P', 8), ('k', 56)}], board._positions_log)
+    def test_adds_captured_piece_to_undo_log(self):
+        board = Board('k7/8/8/8/8/1p6/P7/K7 w - - 0 1')
+        b_pawn = board._get_piece(17)
+        board.make_move((8, 17, None))
+        self.assertEqual([(b_pawn, None, None)], board._undo_log)
 
-    def test_adds_multiple_positions_to_positions_log(self):
-        board = Board('k7/8/8/8/8/8/P7/K7 w - - 0 1')
-        board.make_move((0, 1, None))
-        board.make_move((56, 57, None))
-        self.assertEqual([{('K', 0), ('P', 8), ('k', 56)}, {('K', 1), ('P', 8), ('k', 56)},
-                          {('K', 1), ('P', 8), ('k', 57)}], board._positions_log)
+    def test_adds_pawn_captured_en_passant_to_undo_log(self):
+        board = Board('k7/8/8/3Pp3/8/8/8/K7 w - e6 0 1')
+        b_pawn = board._get_piece(36)
+        board.make_move((35, 44, None))
+        self.assertEqual([(b_pawn, None, None)], board._undo_log)
 
-    def test_adds_only_positions_of_active_pieces_to_positions_log(self):
-        board = Board('k7/P7/8/8/8/8/8/K7 b - - 0 1')
-        board.make_move((56, 48, None))
-        self.assertEqual([{('K', 0), ('P', 48), ('k', 56)}, {('K', 0), ('k', 48)}, ], board._positions_log)
+    def test_adds_promoted_pawn_to_undo_log(self):
+        board = Board('1r5k/P7/8/8/8/8/8/K7 w - - 0 1')
+        w_pawn = board._get_piece(48)
+        b_rook = board._get_piece(57)
+        board.make_move((48, 57, 'Q'))
+        self.assertEqual([(b_rook, w_pawn, None)], board._undo_log)
+
+    def test_adds_castling_rook_move_to_undo_log(self):
+        board = Board('r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1')
+        board.make_move((60, 58, None))
+        self.assertEqual([(None, None, (56, 59))], board._undo_log)
+
+    def test_adds_zobrist_key_to_zobrist_log(self):
+        board = Board('k7/8/8/8/8/8/P7/K7 w - - 0 1')
+        key = board.zobrist_key
+        board.make_move((8, 16, None))
+        self.assertEqual([key, board._get_zobrist_key()], board._zobrist_log)
+
+    def test_updates_zobrist_key_incrementally(self):
+        for fen, move in (('k7/8/8/8/8/8/P7/K7 w - - 0 1', (8, 24, None)),
+                          ('k7/8/8/8/1p6/8/P7/K7 w - - 0 1', (8, 24, None)),
+                          ('k7/8/8/3Pp3/8/8/8/K7 w - e6 0 1', (35, 44, None)),
+                          ('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1', (4, 6, None)),
+                          ('r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1', (60, 58, None)),
+                          ('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1', (0, 56, None)),
+                          ('1r5k/P7/8/8/8/8/8/K7 w - - 0 1', (48, 57, 'Q'))):
+            board = Board(fen)
+            board.make_move(move)
+            self.assertEqual(board._get_zobrist_key(), board.zobrist_key)
+
+    def test_transpositions_have_same_zobrist_key(self):
+        board_a = Board()
+        board_b = Board()
+        for move in ((1, 18, None), (57, 42, None), (6, 21, None)):
+            board_a.make_move(move)
+        for move in ((6, 21, None), (57, 42, None), (1, 18, None)):
+            board_b.make_move(move)
+        self.assertEqual(board_a.zobrist_key, board_b.zobrist_key)
 
 
 class UndoMoveTestCase(unittest.TestCase):
@@ -1638,17 +1740,34 @@ class UndoMoveTestCase(unittest.TestCase):
         board._undo_move()
         self.assertEqual(5, board._turn_number)
 
-    def test_removes_last_positions_from_positions_log(self):
+    def test_removes_last_undo_record_from_undo_log(self):
+        board = Board('1r5k/P7/8/8/8/8/8/K7 w - - 0 1')
+        board.make_move((48, 57, 'Q'))
+        board._undo_move()
+        self.assertEqual([], board._undo_log)
+
+    def test_restores_pieces_from_undo_record(self):
+        fen = '1r5k/P7/8/8/8/8/8/K7 w - - 0 1'
+        board = Board(fen)
+        pieces = set(board._active_pieces)
+        board.make_move((48, 57, 'Q'))
+        board._undo_move()
+        self.assertEqual(pieces, board._active_pieces)
+        self.assertEqual(fen, board.fen)
+
+    def test_removes_last_key_from_zobrist_log(self):
         board = Board('k7/8/8/8/8/8/8/K7 w - - 0 1')
+        key = board.zobrist_key
         board.make_move((0, 1, None))
         board._undo_move()
-        self.assertEqual([{('k', 56), ('K', 0)}], board._positions_log)
+        self.assertEqual([key], board._zobrist_log)
 
-    def test_removes_any_last_positions_from_positions_log(self):
-        board = Board('k7/8/8/8/8/8/8/K7 w - - 0 1')
-        board.make_move((0, 8, None))
+    def test_restores_zobrist_key(self):
+        board = Board('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+        key = board.zobrist_key
+        board.make_move((4, 6, None))
         board._undo_move()
-        self.assertEqual([{('k', 56), ('K', 0)}], board._positions_log)
+        self.assertEqual(key, board.zobrist_key)
 
 
 class EvaluationTestCase(unittest.TestCase):
@@ -1827,6 +1946,32 @@ class EvaluationTestCase(unittest.TestCase):
     def test_value_of_dead_position_is_zero(self):
         self.assertEqual(0, Board('k7/8/8/8/8/8/8/KB6 w - - 0 1').val)
 
+    def test_static_eval_does_not_detect_checkmate(self):
+        board = Board('k7/8/8/8/8/2b5/1q6/K7 w - - 0 1')
+        self.assertEqual(board._get_score(), board.static_eval)
+
+    def test_static_eval_does_not_detect_draws(self):
+        board = Board('k7/8/8/8/8/8/8/KB6 w - - 0 1')
+        self.assertEqual(board._get_score(), board.static_eval)
+
+    def test_score_is_updated_by_make_move(self):
+        # captures, castling, en passant and promotions
+        board = Board('r3k2r/pP1p2pp/8/2P5/8/8/6PP/R3K2R w KQkq - 0 1')
+        for move in ((4, 6, None), (51, 35, None), (34, 43, None), (60, 58, None), (49, 56, 'Q'), (59, 56, None)):
+            board.make_move(move)
+            self.assertEqual(board._get_score(), board._score)
+
+    def test_score_is_restored_by_undo_move(self):
+        board = Board('r3k2r/pP1p2pp/8/2P5/8/8/6PP/R3K2R w KQkq - 0 1')
+        scores = [board.static_eval]
+        for move in ((4, 6, None), (51, 35, None), (34, 43, None), (60, 58, None), (49, 56, 'Q')):
+            board.make_move(move)
+            scores.append(board.static_eval)
+        for score in reversed(scores):
+            self.assertEqual(score, board.static_eval)
+            if board._moves_log:
+                board._undo_move()
+
 
 
 """
@@ -0,0 +1,45 @@
+import unittest
+
+import packed_move
+
+
+class EncodingTestCase(unittest.TestCase):
+    def test_encodes_squares(self):
+        self.assertEqual(12 | 28 << 6, packed_move.encode((12, 28, None)))
+
+    def test_encodes_promotion_type(self):
+        self.assertEqual(4, packed_move.promotion_type(packed_move.encode((48, 56, 'Q'))))
+        self.assertEqual(1, packed_move.promotion_type(packed_move.encode((8, 0, 'n'))))
+
+    def test_move_without_promotion_has_no_promotion_type(self):
+        self.assertEqual(0, packed_move.promotion_type(packed_move.encode((12, 28, None))))
+
+    def test_black_promotions_differ_from_white_promotions(self):
+        self.assertNotEqual(packed_move.encode((8, 0, 'Q')), packed_move.encode((8, 0, 'q')))
+
+    def test_fits_into_16_bits(self):
+        self.assertLess(packed_move.encode((63, 63, 'q')), 1 << 16)
+
+
+class DecodingTestCase(unittest.TestCase):
+    def test_decodes_every_move(self):
+        for move in ((0, 63, None), (63, 0, None), (12, 28, None), (48, 56, 'Q'), (55, 62, 'R'), (9, 0, 'b'),
+                     (15, 7, 'n')):
+            self.assertEqual(move, packed_move.decode(packed_move.encode(move)))
+
+    def test_gets_squares(self):
+        move = packed_move.encode((52, 61, 'B'))
+        self.assertEqual(52, packed_move.from_square(move))
+        self.assertEqual(61, packed_move.to_square(move))
+
+    def test_gets_promotion_symbol(self):
+        self.assertEqual('r', packed_move.promotion_symbol(packed_move.encode((9, 1, 'r'))))
+        self.assertIsNone(packed_move.promotion_symbol(packed_move.encode((9, 1, None))))
+
+    def test_to_tuple_converts_packed_moves_only(self):
+        self.assertEqual((12, 28, None), packed_move.to_tuple(packed_move.encode((12, 28, None))))
+        self.assertEqual((12, 28, None), packed_move.to_tuple((12, 28, None)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,21 +1,16 @@
 """
 a set of tests that test the move generation thoroughly
 """
+import os
+import tempfile
 import unittest
 from typing import List
 
+from bitboard import BitBoard
 from board import Board
-
-
-# if board.checkmate or board.stalemate return 0 or len(board.legal_moves)
-def perft_legal_moves(board: Board, depth: int) -> int:
-    if depth == 1:
-        return len(board.legal_moves)
-    nodes: int = 0
-    for move in board.legal_moves:
-        with board.make_move_and_undo_move_afterwards(move):
-            nodes += perft_legal_moves(board, depth - 1)
-    return nodes
+from perft import BULK, EXTRA, HASHED, MISSING, NO_REFERENCE, PLAIN, divide, load_reference, localize_bug, perft, \
+    perft_details, perft_legal_moves, reference_from_engine, reference_from_file
+from transposition import TranspositionTable
 
 
 class LegalMovesPerftAlgorithmTestCase(unittest.TestCase):
@@ -39,6 +34,140 @@ class LegalMovesPerftAlgorithmTestCase(unittest.TestCase):
         self.assertEqual(4, perft_legal_moves(board, 1))
 
 
+class HashedPerftTestCase(unittest.TestCase):
+    def test_hashed_perft_counts_same_nodes(self):
+        board = Board('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        self.assertEqual(97_862, perft_legal_moves(board, 3, TranspositionTable(1)))
+
+    def test_hashed_perft_reuses_transpositions(self):
+        tt = TranspositionTable(1)
+        board = Board('k7/8/8/8/8/8/8/K6R w - - 0 1')
+        self.assertEqual(perft_legal_moves(board, 5), perft_legal_moves(board, 5, tt))
+        self.assertGreater(tt.hits, 0)
+
+    def test_hashed_perft_is_correct_with_tiny_table(self):
+        self.assertEqual(8_902, perft_legal_moves(Board(), 3, TranspositionTable(0.001)))
+
+
+class PerftModesTestCase(unittest.TestCase):
+    fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+
+    def test_all_modes_count_same_nodes(self):
+        for mode in (PLAIN, BULK, HASHED):
+            self.assertEqual(2_039, perft(Board(self.fen), 2, mode))
+
+    def test_depth_zero_counts_the_position_itself(self):
+        self.assertEqual(1, perft(Board(), 0))
+        self.assertEqual(1, perft(Board(), 0, PLAIN))
+
+    def test_unknown_mode_raises_value_error(self):
+        self.assertRaises(ValueError, perft, Board(), 1, 'unknown')
+
+    def test_hashed_perft_keeps_counts_of_different_depths_apart(self):
+        tt = TranspositionTable(1)
+        board = Board(self.fen)
+        self.assertEqual(2_039, perft_legal_moves(board, 2, tt))
+        self.assertEqual(97_862, perft_legal_moves(board, 3, tt))
+        self.assertEqual(2_039, perft_legal_moves(board, 2, tt))
+
+
+class PerftDetailsTestCase(unittest.TestCase):
+    def test_details_match_reference_table_of_position_2(self):
+        board = Board('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        self.assertEqual({'nodes': 97_862, 'captures': 17_102, 'en_passant': 45, 'castles': 3_162, 'promotions': 0,
+                          'checks': 993, 'checkmates': 1}, perft_details(board, 3))
+
+    def test_details_count_promotions(self):
+        board = Board('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1')
+        self.assertEqual({'nodes': 264, 'captures': 87, 'en_passant': 0, 'castles': 6, 'promotions': 48,
+                          'checks': 10, 'checkmates': 0}, perft_details(board, 2))
+
+    def test_details_equal_for_bitboard(self):
+        fen = '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1'
+        self.assertEqual(perft_details(Board(fen), 3), perft_details(BitBoard(fen), 3))
+
+    def test_depth_zero_counts_the_position_itself(self):
+        self.assertEqual(1, perft_details(Board(), 0)['nodes'])
+
+
+class ParallelPerftTestCase(unittest.TestCase):
+    fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+
+    def test_divide_counts_nodes_per_root_move(self):
+        counts = divide(self.fen, 2)
+        self.assertEqual(Board(self.fen).legal_moves, set(counts))
+        self.assertEqual(2_039, sum(counts.values()))
+
+    def test_divide_at_depth_one_counts_every_move_once(self):
+        self.assertEqual({1}, set(divide(self.fen, 1).values()))
+
+    def test_parallel_divide_equals_sequential_divide(self):
+        self.assertEqual(divide(self.fen, 3, board_type='bitboard'), divide(self.fen, 3, 2, board_type='bitboard'))
+
+    def test_splitting_second_ply_gives_same_counts(self):
+        self.assertEqual(divide(self.fen, 3, board_type='bitboard'),
+                         divide(self.fen, 3, 2, 2, board_type='bitboard'))
+
+    def test_divide_in_hashed_mode_gives_same_counts(self):
+        self.assertEqual(divide(self.fen, 3, board_type='bitboard'),
+                         divide(self.fen, 3, board_type='bitboard', mode=HASHED))
+
+    def test_depth_must_be_positive(self):
+        self.assertRaises(ValueError, divide, self.fen, 0)
+
+
+class LocalizeBugTestCase(unittest.TestCase):
+    fen = 'k7/8/8/8/8/8/8/K6R w - - 0 1'
+
+    def setUp(self) -> None:
+        board = Board(self.fen)
+        board.make_move((7, 63, None))
+        self.child_fen = board.fen
+        self.engine_reference = reference_from_engine('bitboard')
+
+    def test_no_divergence_if_counts_equal_reference(self):
+        self.assertIsNone(localize_bug(self.fen, 3, self.engine_reference))
+
+    def test_descends_to_position_with_missing_move(self):
+        def reference(fen, depth):
+            counts = self.engine_reference(fen, depth)
+            if fen == self.fen:
+                counts['h1h8'] += 1
+            elif fen == self.child_fen:
+                counts['a8b8'] = 1
+            return counts
+
+        self.assertEqual((['h1h8'], self.child_fen, 'a8b8', MISSING), localize_bug(self.fen, 2, reference))
+
+    def test_reports_extra_move(self):
+        def reference(fen, depth):
+            counts = self.engine_reference(fen, depth)
+            del counts['h1h8']
+            return counts
+
+        self.assertEqual(([], self.fen, 'h1h8', EXTRA), localize_bug(self.fen, 2, reference))
+
+    def test_stops_if_reference_has_no_divide_of_the_position(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'reference.txt')
+            counts = self.engine_reference(self.fen, 2)
+            counts['h1h8'] += 1
+            with open(path, 'w') as file:
+                file.write(f'position fen {self.fen}\ngo perft 2\n')
+                file.writelines(f'{move}: {nodes}\n' for move, nodes in counts.items())
+            self.assertEqual((['h1h8'], self.child_fen, None, NO_REFERENCE),
+                             localize_bug(self.fen, 2, reference_from_file(path)))
+
+    def test_load_reference_reads_uci_perft_session(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'reference.txt')
+            with open(path, 'w') as file:
+                file.write('position startpos\ngo perft 1\na2a3: 1\n\nNodes searched: 1\n'
+                           'position fen 7k/P7/8/8/8/8/8/K7 w - - 3 9\ngo perft 1\na7a8Q: 1\n')
+            self.assertEqual({('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -', 1): {'a2a3': 1},
+                              ('7k/P7/8/8/8/8/8/K7 w - -', 1): {'a7a8q': 1}}, load_reference(path))
+
+
 class PerftPositionsTestCase(unittest.TestCase):
     def test_starting_position(self):
         search_depth: int = 3  # min: 1; max: 15
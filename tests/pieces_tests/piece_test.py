@@ -1,6 +1,7 @@
 import unittest
 
 from board import Piece, Board
+from pieces import KING_TARGETS, KNIGHT_TARGETS, PAWN_ATTACKS, RAYS
 
 """
 tests can only be run when all abstract methods are commented out
@@ -146,3 +147,31 @@ def main() -> None:
 
 if __name__ == '__main__':
     main()
+
+
+class AttackTablesTestCase(unittest.TestCase):
+    def test_rays_are_ordered_from_nearest_square_to_edge(self):
+        self.assertEqual([28, 37, 46, 55], RAYS[9][19])
+        self.assertEqual([11, 3], RAYS[-8][19])
+
+    def test_rays_end_at_edge_of_board(self):
+        self.assertEqual([], RAYS[1][7])
+        self.assertEqual([], RAYS[7][56])
+
+    def test_knight_targets_stay_on_board(self):
+        self.assertEqual({10, 17}, set(KNIGHT_TARGETS[0]))
+        self.assertEqual(8, len(KNIGHT_TARGETS[27]))
+
+    def test_king_targets_stay_on_board(self):
+        self.assertEqual({1, 8, 9}, set(KING_TARGETS[0]))
+
+    def test_pawn_attacks_depend_on_color(self):
+        self.assertEqual({25, 27}, set(PAWN_ATTACKS[True][18]))
+        self.assertEqual({9, 11}, set(PAWN_ATTACKS[False][18]))
+
+    def test_pawn_attacks_stay_on_board(self):
+        self.assertEqual([17], PAWN_ATTACKS[True][8])
+
+    def test_pieces_do_not_build_own_tables(self):
+        self.assertNotIn('_MAX_MOVES', vars(piece1))
+
@@ -33,6 +33,27 @@ class RandomMoveSelectionTestCase(unittest.TestCase):
             self.assertTrue(w_player._get_random_move(board) in board.legal_moves)
 
 
+class SearchMoveSelectionTestCase(unittest.TestCase):
+    def test_mode_is_random_by_default(self):
+        self.assertEqual(ComPlayer.RANDOM, w_player.mode)
+
+    def test_mode_is_given_mode(self):
+        self.assertEqual(ComPlayer.SEARCH, ComPlayer(True, ComPlayer.SEARCH).mode)
+
+    def test_unknown_mode_raises_error(self):
+        self.assertRaises(ValueError, ComPlayer, True, 'best')
+
+    def test_selects_best_move_in_search_mode(self):
+        player = ComPlayer(True, ComPlayer.SEARCH, 2)
+        self.assertEqual((7, 63, None), player._get_search_move(Board('k7/8/1K6/8/8/8/8/7R w - - 0 1')))
+
+    def test_respects_node_budget(self):
+        player = ComPlayer(False, ComPlayer.SEARCH, 10, 500)
+        board = Board()
+        board.make_move((12, 28, None))
+        self.assertIn(player._get_search_move(board), board.legal_moves)
+
+
 def main() -> None:
     unittest.main()
 
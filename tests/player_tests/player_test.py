@@ -1,5 +1,6 @@
 import unittest
 
+import packed_move
 from player import Player
 
 
@@ -59,6 +60,9 @@ class UIConversionTestCase(unittest.TestCase):
     def test_converts_black_promotion_moves_as_well(self):
         self.assertEqual('a2a1q', w_player._move_to_str((8, 0, 'q')))
 
+    def test_converts_packed_moves(self):
+        self.assertEqual('a2a1q', w_player._move_to_str(packed_move.encode((8, 0, 'q'))))
+
     def test_converts_str_move_to_ints(self):
         self.assertEqual((0, 9, None), w_player._move_to_ints('a1b2'))
 
@@ -0,0 +1,104 @@
+import unittest
+
+from bitboard import BitBoard
+from board import Board
+from search import MATE_SCORE, Search
+
+
+class SearchResultTestCase(unittest.TestCase):
+    def test_finds_mate_in_one(self):
+        move, score = Search(Board('k7/8/1K6/8/8/8/8/7R w - - 0 1'), 2).search()
+        self.assertEqual((7, 63, None), move)
+        self.assertEqual(MATE_SCORE - 1, score)
+
+    def test_finds_mate_in_two(self):
+        move, score = Search(Board('k7/8/2K5/8/8/8/8/1R6 w - - 0 1'), 3).search()
+        self.assertEqual(MATE_SCORE - 3, score)
+
+    def test_captures_hanging_queen(self):
+        move, _ = Search(Board('4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1'), 2).search()
+        self.assertEqual((3, 35, None), move)
+
+    def test_scores_mated_position(self):
+        move, score = Search(Board('k7/8/8/8/8/2b5/1q6/K7 w - - 0 1'), 3).search()
+        self.assertIsNone(move)
+        self.assertEqual(-MATE_SCORE, score)
+
+    def test_scores_stalemate_as_draw(self):
+        move, score = Search(Board('k7/8/8/8/8/2b5/1r6/K7 w - - 0 1'), 3).search()
+        self.assertIsNone(move)
+        self.assertEqual(0, score)
+
+    def test_searches_bitboard_as_well(self):
+        fen = '4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1'
+        self.assertEqual(Search(Board(fen), 3).search(), Search(BitBoard(fen), 3).search())
+
+    def test_alpha_beta_returns_same_score_as_minimax(self):
+        fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+        board = BitBoard(fen)
+
+        def minimax(depth: int) -> int:
+            if depth == 0:
+                return int(board.val)
+            best = -MATE_SCORE - 1
+            for move in board.legal_moves:
+                with board.make_move_and_undo_move_afterwards(move):
+                    best = max(best, -minimax(depth - 1))
+            return best
+
+        self.assertEqual(minimax(2), Search(BitBoard(fen), 2, quiescence=False).search()[1])
+
+    def test_does_not_change_board(self):
+        board = Board('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        Search(board, 2).search()
+        self.assertEqual('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1', board.fen)
+
+
+class IterationInfoTestCase(unittest.TestCase):
+    def test_reports_every_iteration(self):
+        infos = []
+        Search(BitBoard(), 3, on_iteration=infos.append).search()
+        self.assertEqual([1, 2, 3], [info[0] for info in infos])
+
+    def test_nodes_increase_with_depth(self):
+        search = Search(BitBoard(), 3)
+        search.search()
+        nodes = [info[2] for info in search.iterations]
+        self.assertEqual(sorted(nodes), nodes)
+        self.assertEqual(search.nodes, nodes[-1])
+        self.assertTrue(all(info[3] > 0 for info in search.iterations))
+
+    def test_principal_variation_has_length_of_depth(self):
+        search = Search(BitBoard(), 3)
+        move, _ = search.search()
+        self.assertEqual(3, len(search.principal_variation))
+        self.assertEqual(move, search.principal_variation[0])
+
+    def test_principal_variation_consists_of_legal_moves(self):
+        board = BitBoard('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        search = Search(board, 3)
+        search.search()
+        for move in search.principal_variation:
+            self.assertIn(move, board.legal_moves)
+            board.make_move(move)
+
+
+class NodeBudgetTestCase(unittest.TestCase):
+    def test_stops_at_node_budget(self):
+        search = Search(BitBoard(), 10, max_nodes=2_000)
+        move, _ = search.search()
+        self.assertLessEqual(search.nodes, 2_001)
+        self.assertIn(move, BitBoard().legal_moves)
+
+    def test_returns_move_of_last_completed_iteration(self):
+        search = Search(BitBoard(), 10, max_nodes=2_000)
+        move, score = search.search()
+        self.assertEqual((move, score), (search.iterations[-1][4][0], search.iterations[-1][1]))
+
+    def test_returns_legal_move_if_no_iteration_completes(self):
+        move, _ = Search(BitBoard(), 5, max_nodes=3).search()
+        self.assertIn(move, BitBoard().legal_moves)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from bitboard import BitBoard
+from search import Search
+from transposition import EXACT, LOWER, UPPER, TranspositionTable
+
+
+class ConstructionTestCase(unittest.TestCase):
+    def test_capacity_depends_on_memory_cap(self):
+        self.assertEqual(2 * TranspositionTable(1).capacity, TranspositionTable(2).capacity)
+
+    def test_has_at_least_one_bucket(self):
+        self.assertEqual(2, TranspositionTable(0).capacity)
+
+    def test_is_empty(self):
+        self.assertEqual(0, len(TranspositionTable(1)))
+
+
+class ProbeTestCase(unittest.TestCase):
+    def test_finds_stored_entry(self):
+        tt = TranspositionTable(1)
+        tt.store(42, 3, EXACT, 15, (12, 28, None))
+        self.assertEqual((42, 3, EXACT, 15, (12, 28, None)), tt.probe(42))
+
+    def test_counts_hits_and_misses(self):
+        tt = TranspositionTable(1)
+        tt.store(42, 3, EXACT, 15, None)
+        tt.probe(42)
+        tt.probe(43)
+        self.assertEqual((1, 1, 0), (tt.hits, tt.misses, tt.collisions))
+
+    def test_counts_collisions(self):
+        tt = TranspositionTable(0)
+        tt.store(42, 3, EXACT, 15, None)
+        self.assertIsNone(tt.probe(43))
+        self.assertEqual(1, tt.collisions)
+
+    def test_clear_removes_entries_and_counters(self):
+        tt = TranspositionTable(1)
+        tt.store(42, 3, EXACT, 15, None)
+        tt.probe(42)
+        tt.clear()
+        self.assertIsNone(tt.probe(42))
+        self.assertEqual((0, 1), (tt.hits, tt.misses))
+
+
+class ReplacementTestCase(unittest.TestCase):
+    def test_deeper_entry_replaces_depth_preferred_slot_and_keeps_old_entry(self):
+        tt = TranspositionTable(0)
+        tt.store(1, 2, EXACT, 10, None)
+        tt.store(2, 5, LOWER, 20, None)
+        self.assertEqual(5, tt.probe(2)[1])
+        self.assertEqual(2, tt.probe(1)[1])
+
+    def test_shallower_entry_goes_to_always_replace_slot(self):
+        tt = TranspositionTable(0)
+        tt.store(1, 5, EXACT, 10, None)
+        tt.store(2, 2, UPPER, 20, None)
+        tt.store(3, 1, UPPER, 30, None)
+        self.assertIsNotNone(tt.probe(1))
+        self.assertIsNone(tt.probe(2))
+        self.assertIsNotNone(tt.probe(3))
+
+    def test_same_position_replaces_its_entry(self):
+        tt = TranspositionTable(0)
+        tt.store(1, 5, EXACT, 10, None)
+        tt.store(1, 2, LOWER, 20, None)
+        self.assertEqual((1, 2, LOWER, 20, None), tt.probe(1))
+        self.assertEqual(1, len(tt))
+
+    def test_hashfull_is_given_in_permille(self):
+        tt = TranspositionTable(0)
+        tt.store(1, 5, EXACT, 10, None)
+        self.assertEqual(500, tt.hashfull)
+
+
+class SearchWithTableTestCase(unittest.TestCase):
+    fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+
+    def test_search_returns_same_score_with_table(self):
+        self.assertEqual(Search(BitBoard(self.fen), 3).search()[1],
+                         Search(BitBoard(self.fen), 3, tt=TranspositionTable(4)).search()[1])
+
+    def test_search_visits_fewer_nodes_with_table(self):
+        search = Search(BitBoard(self.fen), 3)
+        search.search()
+        hashed_search = Search(BitBoard(self.fen), 3, tt=TranspositionTable(4))
+        hashed_search.search()
+        self.assertLess(hashed_search.nodes, search.nodes)
+
+    def test_search_fills_table(self):
+        tt = TranspositionTable(4)
+        Search(BitBoard(self.fen), 2, tt=tt).search()
+        self.assertEqual(EXACT, tt.probe(BitBoard(self.fen).zobrist_key)[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from typing import List
 
+# benchmark tests
+import bench_test
 # game tests
 import game_test
 # pieces tests
@@ -16,7 +18,12 @@ import player_tests.com_player_test as com_player_test
 import player_tests.human_player_test as human_player_test
 import player_tests.player_test as player_test
 # board tests
+import tests.board_tests.bitboard_test as bitboard_test
 import tests.board_tests.board_test as board_test
+import tests.board_tests.packed_move_test as packed_move_test
+# search tests
+import tests.search_tests.search_test as search_test
+import tests.search_tests.transposition_test as transposition_test
 
 
 def test_piece_classes() -> None:
@@ -28,7 +35,15 @@ def test_player_classes() -> None:
 
 
 def test_board_classes() -> None:
-    run_test_modules([board_test])
+    run_test_modules([bitboard_test, board_test, packed_move_test])
+
+
+def test_search() -> None:
+    run_test_modules([search_test, transposition_test])
+
+
+def test_benchmark() -> None:
+    run_test_modules([bench_test])
 
 
 def test_game_classes() -> None:
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple, TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from chess import MOVE
+
+"""
+fixed-size transposition table
+every bucket has two slots: the first one keeps the entry searched to the greatest depth, the second one is always
+replaced by new entries that do not qualify for the first slot
+"""
+
+# bound types of stored scores
+EXACT: int = 0
+LOWER: int = 1  # score is at least the stored score (fail high)
+UPPER: int = 2  # score is at most the stored score (fail low)
+
+# format: Tuple[zobrist key, depth, bound type, score, best move]
+ENTRY = Tuple[int, int, int, int, Union[None, 'MOVE']]
+
+_ENTRY_BYTES: int = 128  # approximate memory of one entry including its key and slot reference
+
+
+class TranspositionTable:
+    def __init__(self, size_mb: float = 16) -> None:
+        """
+        :param size_mb: memory cap of the table in megabytes
+        """
+        self._n_buckets: int = max(1, int(size_mb * 2 ** 20) // (2 * _ENTRY_BYTES))
+        self._slots: List[Union[None, ENTRY]] = [None] * (2 * self._n_buckets)
+        self._hits: int = 0
+        self._misses: int = 0
+        self._collisions: int = 0
+
+    def __len__(self) -> int:
+        return 2 * self._n_buckets - self._slots.count(None)
+
+    """
+    attribute getters
+    """
+
+    @property
+    def capacity(self) -> int:
+        """
+        :return: maximum number of entries
+        """
+        return 2 * self._n_buckets
+
+    @property
+    def hits(self) -> int:
+        """
+        :return: number of probes that found an entry
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        :return: number of probes that found no entry
+        """
+        return self._misses
+
+    @property
+    def collisions(self) -> int:
+        """
+        :return: number of missed probes whose bucket was occupied by entries of other positions
+        """
+        return self._collisions
+
+    @property
+    def hashfull(self) -> int:
+        """
+        :return: occupied slots in permille
+        """
+        return len(self) * 1000 // self.capacity
+
+    """
+    probe and store
+    """
+
+    def probe(self, key: int) -> Union[None, ENTRY]:
+        """
+        get the entry of a position
+        :param key: zobrist key of the position
+        :return: format: Tuple[zobrist key, depth, bound type, score, best move] or None if there is no entry
+        """
+        index = (key % self._n_buckets) << 1
+        slots = self._slots
+        for entry in (slots[index], slots[index + 1]):
+            if entry is not None and entry[0] == key:
+                self._hits += 1
+                return entry
+        self._misses += 1
+        if slots[index] is not None or slots[index + 1] is not None:
+            self._collisions += 1
+        return None
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: Optional[MOVE]) -> None:
+        """
+        store the result of a search; the entry replaces the depth-preferred slot if it is at least as deep as the
+        entry there or belongs to the same position, otherwise it replaces the always-replace slot
+        :param key: zobrist key of the position
+        :param depth: remaining depth of the search
+        :param bound: EXACT, LOWER or UPPER
+        :param score: score of the position
+        :param move: best move found or None
+        """
+        index = (key % self._n_buckets) << 1
+        slots = self._slots
+        deep = slots[index]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            slots[index] = (key, depth, bound, score, move)
+            if deep is not None and not deep[0] == key:  # keep the replaced entry as long as possible
+                slots[index + 1] = deep
+            elif slots[index + 1] is not None and slots[index + 1][0] == key:  # remove the outdated entry
+                slots[index + 1] = None
+        else:
+            slots[index + 1] = (key, depth, bound, score, move)
+
+    def clear(self) -> None:
+        """
+        remove all entries and reset the counters
+        """
+        self._slots = [None] * (2 * self._n_buckets)
+        self._hits = 0
+        self._misses = 0
+        self._collisions = 0
@@ -0,0 +1,63 @@
+import random
+from typing import Dict, Iterable, List, Tuple, Union
+
+"""
+random keys for zobrist hashing
+the key of a position is the xor of the keys of all pieces on their squares, of the castling rights, of the en passant
+target square and, if black is to move, of the black to move key
+"""
+
+_random = random.Random(0x5EED)
+
+# format: Dict[fen symbol, List[key per square]]
+PIECE_KEYS: Dict[str, List[int]] = {symbol: [_random.getrandbits(64) for _ in range(64)] for symbol in 'PNBRQKpnbrqk'}
+BLACK_TO_MOVE_KEY: int = _random.getrandbits(64)
+_CASTLING_RIGHT_KEYS: List[int] = [_random.getrandbits(64) for _ in range(4)]
+# indexed by the castling rights as bit mask; format: K = 1, Q = 2, k = 4, q = 8
+CASTLING_KEYS: List[int] = [0] * 16
+for _rights in range(16):
+    for _i in range(4):
+        if _rights >> _i & 1:
+            CASTLING_KEYS[_rights] ^= _CASTLING_RIGHT_KEYS[_i]
+EP_KEYS: List[int] = [_random.getrandbits(64) for _ in range(64)]
+
+
+def castling_rights_to_index(castling_rights: List[bool]) -> int:
+    """
+    convert castling rights to their bit mask
+    :param castling_rights: format: List[K, Q, k, q]
+    :return: index into CASTLING_KEYS
+    """
+    return castling_rights[0] | (castling_rights[1] << 1) | (castling_rights[2] << 2) | (castling_rights[3] << 3)
+
+
+def state_key(white_to_move: bool, castling_index: int, ep_target_square: Union[None, int]) -> int:
+    """
+    get the part of the key that does not depend on the pieces
+    :param white_to_move: color to move
+    :param castling_index: castling rights as bit mask
+    :param ep_target_square: en passant target square
+    :return: xor of the color, castling rights and en passant keys
+    """
+    key = CASTLING_KEYS[castling_index]
+    if not white_to_move:
+        key ^= BLACK_TO_MOVE_KEY
+    if ep_target_square is not None:
+        key ^= EP_KEYS[ep_target_square]
+    return key
+
+
+def get_key(positions: Iterable[Tuple[str, int]], white_to_move: bool, castling_index: int,
+            ep_target_square: Union[None, int]) -> int:
+    """
+    compute the key of a position from scratch
+    :param positions: format: Iterable[Tuple[fen symbol, pos]]
+    :param white_to_move: color to move
+    :param castling_index: castling rights as bit mask
+    :param ep_target_square: en passant target square
+    :return: zobrist key of the position
+    """
+    key = state_key(white_to_move, castling_index, ep_target_square)
+    for symbol, pos in positions:
+        key ^= PIECE_KEYS[symbol][pos]
+    return key